@@ -0,0 +1,104 @@
+import discord
+import logging
+import os
+from collections import OrderedDict
+
+from audio.opus import iter_opus_packets, is_content_addressed
+from storage import async_fs
+
+SOUND_CACHE_BYTES = int(os.getenv("SOUND_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+
+class OpusFrameSource(discord.AudioSource):
+    def __init__(self, frames: tuple[bytes, ...]):
+        self._frames = iter(frames)
+
+    def read(self) -> bytes:
+        return next(self._frames, b"")
+
+    def is_opus(self) -> bool:
+        return True
+
+
+def _read_frames(filepath: str, max_bytes: int) -> tuple[bytes, ...] | None:
+    if not os.path.isfile(filepath) or os.path.getsize(filepath) > max_bytes:
+        return None
+    with open(filepath, "rb") as fp:
+        return tuple(iter_opus_packets(fp))
+
+
+def _cache_key(guild_id: int, filename: str) -> str | tuple[int, str]:
+    if is_content_addressed(filename):
+        return filename
+    return guild_id, filename
+
+
+class FrameCache:
+    def __init__(self, max_bytes: int = SOUND_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str | tuple[int, str], tuple[bytes, ...]] = OrderedDict()
+        self._sizes: dict[str | tuple[int, str], int] = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, guild_id: int, filename: str) -> tuple[bytes, ...] | None:
+        key = _cache_key(guild_id, filename)
+        frames = self._entries.get(key)
+        if frames is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return frames
+
+    def put(self, guild_id: int, filename: str, frames: tuple[bytes, ...]):
+        key = _cache_key(guild_id, filename)
+        entry_size = sum(len(frame) for frame in frames)
+        if entry_size > self.max_bytes:
+            return
+
+        self.discard(guild_id, filename)
+        self._entries[key] = frames
+        self._sizes[key] = entry_size
+        self.size += entry_size
+
+        while self.size > self.max_bytes:
+            evicted, _ = self._entries.popitem(last=False)
+            self.size -= self._sizes.pop(evicted)
+            logging.info(f"[FrameCache] Evicted {evicted}")
+
+    async def load(self, guild_id: int, filename: str, filepath: str) -> tuple[bytes, ...] | None:
+        frames = self.get(guild_id, filename)
+        if frames is not None:
+            return frames
+
+        frames = await async_fs.run(_read_frames, filepath, self.max_bytes)
+        if frames is not None:
+            self.put(guild_id, filename, frames)
+        return frames
+
+    def discard(self, guild_id: int, filename: str):
+        key = _cache_key(guild_id, filename)
+        if key in self._entries:
+            del self._entries[key]
+            self.size -= self._sizes.pop(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._sizes.clear()
+        self.size = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+frame_cache = FrameCache()
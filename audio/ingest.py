@@ -0,0 +1,130 @@
+import asyncio
+import json
+import logging
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+from audio.opus import OPUS_BITRATE
+
+SOUND_MAX_BYTES = int(os.getenv("SOUND_MAX_BYTES", str(8 * 1024 * 1024)))
+SOUND_MAX_SECONDS = float(os.getenv("SOUND_MAX_SECONDS", "30"))
+SOUND_TARGET_LUFS = float(os.getenv("SOUND_TARGET_LUFS", "-16"))
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+INGEST_TIMEOUT = float(os.getenv("INGEST_TIMEOUT", "60"))
+
+_LOUDNORM = f"loudnorm=I={SOUND_TARGET_LUFS}:TP=-1.5:LRA=11"
+
+
+class IngestError(Exception):
+    pass
+
+
+class IngestResult:
+    def __init__(self, duration_ms: int, loudness_lufs: float | None):
+        self.duration_ms = duration_ms
+        self.loudness_lufs = loudness_lufs
+
+
+def _run(args: list[str]) -> subprocess.CompletedProcess:
+    try:
+        return subprocess.run(args, capture_output=True, text=True, timeout=INGEST_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        raise IngestError("Processing the file took too long.")
+
+
+def _probe(path: str) -> dict:
+    result = _run([
+        "ffprobe", "-v", "error", "-print_format", "json",
+        "-show_format", "-show_streams", path
+    ])
+    if result.returncode != 0:
+        raise IngestError("The file is not a supported audio format.")
+    return json.loads(result.stdout)
+
+
+def _probe_duration(probe: dict) -> float:
+    try:
+        return float(probe["format"]["duration"])
+    except (KeyError, ValueError):
+        raise IngestError("Could not determine the length of the sound.")
+
+
+def _measure_loudness(path: str) -> dict | None:
+    result = _run([
+        "ffmpeg", "-hide_banner", "-nostats", "-i", path, "-vn",
+        "-af", f"{_LOUDNORM}:print_format=json", "-f", "null", "-"
+    ])
+    if result.returncode != 0:
+        raise IngestError("The file could not be decoded.")
+
+    try:
+        stats = json.loads(result.stderr[result.stderr.rindex("{"):])
+    except ValueError:
+        return None
+    if stats.get("input_i") in (None, "-inf"):
+        return None
+    return stats
+
+
+def _transcode(source_path: str, output_path: str, loudness: dict | None):
+    args = ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error", "-i", source_path, "-vn"]
+    if loudness:
+        args += ["-af", (
+            f"{_LOUDNORM}:measured_I={loudness['input_i']}:measured_TP={loudness['input_tp']}"
+            f":measured_LRA={loudness['input_lra']}:measured_thresh={loudness['input_thresh']}"
+            f":offset={loudness['target_offset']}:linear=true"
+        )]
+    args += [
+        "-ac", "2", "-ar", "48000",
+        "-c:a", "libopus", "-b:a", OPUS_BITRATE,
+        "-frame_duration", "20", "-application", "audio",
+        "-f", "ogg", output_path
+    ]
+    result = _run(args)
+    if result.returncode != 0:
+        raise IngestError("The file could not be converted.")
+
+
+def process_sound(source_path: str, output_path: str) -> IngestResult:
+    probe = _probe(source_path)
+    if not any(stream.get("codec_type") == "audio" for stream in probe.get("streams", [])):
+        raise IngestError("The file does not contain any audio.")
+
+    duration = _probe_duration(probe)
+    if duration > SOUND_MAX_SECONDS:
+        raise IngestError(f"Sounds can be at most {SOUND_MAX_SECONDS:g} seconds long.")
+
+    loudness = _measure_loudness(source_path)
+    try:
+        _transcode(source_path, output_path, loudness)
+        duration = _probe_duration(_probe(output_path))
+    except Exception:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+
+    return IngestResult(
+        duration_ms=round(duration * 1000),
+        loudness_lufs=float(loudness["input_i"]) if loudness else None
+    )
+
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=INGEST_WORKERS)
+    return _executor
+
+
+async def ingest_sound(source_path: str, output_path: str) -> IngestResult:
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(_get_executor(), process_sound, source_path, output_path)
+    logging.info(
+        f"Ingested {source_path} -> {output_path} "
+        f"({result.duration_ms} ms, {result.loudness_lufs} LUFS)"
+    )
+    return result
@@ -0,0 +1,167 @@
+import discord
+import asyncio
+import logging
+import os
+import threading
+from typing import Callable
+
+import numpy as np
+
+FRAME_SAMPLES = 960 * 2
+MIXER_MAX_CLIPS = int(os.getenv("MIXER_MAX_CLIPS", "16"))
+MIXER_CLIP_GAIN = float(os.getenv("MIXER_CLIP_GAIN", "0.8"))
+
+
+def opus_pcm_reader(frames: tuple[bytes, ...]) -> Callable[[], bytes]:
+    decoder = discord.opus.Decoder()
+    packets = iter(frames)
+
+    def read() -> bytes:
+        packet = next(packets, None)
+        if packet is None:
+            return b""
+        return decoder.decode(packet, fec=False)
+
+    return read
+
+
+class MixerClip:
+    def __init__(self, read_pcm: Callable[[], bytes], gain: float = MIXER_CLIP_GAIN,
+                 cleanup: Callable[[], None] | None = None):
+        self.read_pcm = read_pcm
+        self.gain = gain
+        self._cleanup = cleanup
+        self._loop = asyncio.get_running_loop()
+        self.done = self._loop.create_future()
+        self.stopped = False
+        self._finished = False
+
+    def stop(self):
+        self.stopped = True
+
+    def finish(self):
+        if self._finished:
+            return
+        self._finished = True
+        if self._cleanup:
+            try:
+                self._cleanup()
+            except Exception as e:
+                logging.warning(f"[Mixer] Error cleaning up clip: {e}")
+        self._loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self):
+        if not self.done.done():
+            self.done.set_result(None)
+
+
+class MixerSource(discord.AudioSource):
+    def __init__(self, max_clips: int = MIXER_MAX_CLIPS):
+        self.max_clips = max_clips
+        self._clips: list[MixerClip] = []
+        self._lock = threading.Lock()
+        self._idle = True
+
+    def add(self, clip: MixerClip) -> bool:
+        dropped = None
+        with self._lock:
+            if len(self._clips) >= self.max_clips:
+                dropped = self._clips.pop(0)
+            self._clips.append(clip)
+            was_idle = self._idle
+            self._idle = False
+        if dropped:
+            dropped.finish()
+        return was_idle
+
+    def has_clips(self) -> bool:
+        with self._lock:
+            return bool(self._clips)
+
+    def read(self) -> bytes:
+        with self._lock:
+            clips = list(self._clips)
+            if not clips:
+                self._idle = True
+                return b""
+
+        mixed = np.zeros(FRAME_SAMPLES, dtype=np.float32)
+        finished = []
+        for clip in clips:
+            try:
+                pcm = b"" if clip.stopped else clip.read_pcm()
+            except Exception as e:
+                logging.error(f"[Mixer] Error reading clip: {e}")
+                pcm = b""
+            if not pcm:
+                finished.append(clip)
+                continue
+            samples = np.frombuffer(pcm, dtype=np.int16)[:FRAME_SAMPLES]
+            mixed[:samples.size] += samples * clip.gain
+
+        if finished:
+            with self._lock:
+                self._clips = [clip for clip in self._clips if clip not in finished]
+            for clip in finished:
+                clip.finish()
+            if len(finished) == len(clips):
+                return self.read()
+
+        np.clip(mixed, -32768, 32767, out=mixed)
+        return mixed.astype(np.int16).tobytes()
+
+    def is_opus(self) -> bool:
+        return False
+
+    def clear(self):
+        with self._lock:
+            clips, self._clips = self._clips, []
+        for clip in clips:
+            clip.finish()
+
+
+class GuildMixer:
+    def __init__(self, vc: discord.VoiceClient):
+        self.vc = vc
+        self.source = MixerSource()
+
+    def add(self, clip: MixerClip):
+        if self.source.add(clip) or not self.vc.is_playing():
+            self._start()
+
+    def _start(self):
+        if self.vc.is_playing() or not self.vc.is_connected():
+            return
+        try:
+            self.vc.play(self.source, after=self._after)
+        except discord.ClientException as e:
+            logging.info(f"[Mixer] Deferring restart: {e}")
+
+    def _after(self, error: Exception | None):
+        if error:
+            logging.error(f"[Mixer] Player error: {error}")
+        self.vc.loop.call_soon_threadsafe(self._on_stream_end)
+
+    def _on_stream_end(self):
+        if not self.vc.is_connected():
+            self.source.clear()
+        elif self.source.has_clips():
+            self._start()
+
+
+_mixers: dict[int, GuildMixer] = {}
+
+
+def get_mixer(vc: discord.VoiceClient) -> GuildMixer:
+    mixer = _mixers.get(vc.guild.id)
+    if not mixer or mixer.vc is not vc:
+        if mixer:
+            mixer.source.clear()
+        mixer = _mixers[vc.guild.id] = GuildMixer(vc)
+    return mixer
+
+
+def discard_mixer(guild_id: int):
+    mixer = _mixers.pop(guild_id, None)
+    if mixer:
+        mixer.source.clear()
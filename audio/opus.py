@@ -0,0 +1,66 @@
+import discord
+import os
+import re
+from discord.oggparse import OggStream
+
+OPUS_EXTENSION = ".opus"
+OPUS_HEADER_PREFIXES = (b"OpusHead", b"OpusTags")
+OPUS_BITRATE = os.getenv("OPUS_BITRATE", "96k")
+
+_OBJECT_NAME = re.compile(r"^[0-9a-f]{64}" + re.escape(OPUS_EXTENSION) + "$")
+
+
+def iter_opus_packets(fp):
+    for packet in OggStream(fp).iter_packets():
+        if packet.startswith(OPUS_HEADER_PREFIXES):
+            continue
+        yield packet
+
+
+def is_content_addressed(filename: str) -> bool:
+    return bool(_OBJECT_NAME.match(filename))
+
+
+class OggOpusSource(discord.AudioSource):
+    def __init__(self, filepath: str):
+        self._file = open(filepath, "rb")
+        self._packets = iter_opus_packets(self._file)
+
+    def read(self) -> bytes:
+        return next(self._packets, b"")
+
+    def is_opus(self) -> bool:
+        return True
+
+    def cleanup(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class PrimedSource(discord.AudioSource):
+    def __init__(self, source: discord.AudioSource):
+        self.source = source
+        try:
+            self._first = source.read()
+        except Exception:
+            source.cleanup()
+            raise
+
+    def read(self) -> bytes:
+        if self._first is not None:
+            data, self._first = self._first, None
+            return data
+        return self.source.read()
+
+    def is_opus(self) -> bool:
+        return self.source.is_opus()
+
+    def cleanup(self):
+        self.source.cleanup()
+
+
+def open_sound_source(filepath: str) -> discord.AudioSource:
+    if is_content_addressed(os.path.basename(filepath)):
+        return OggOpusSource(filepath)
+    return discord.FFmpegOpusAudio(source=filepath, options="-vn")
+
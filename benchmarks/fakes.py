@@ -0,0 +1,332 @@
+import asyncio
+import itertools
+import random
+import threading
+import time
+from collections import deque
+
+import discord
+
+_ids = itertools.count(1_000_000)
+
+
+def next_id() -> int:
+    return next(_ids)
+
+
+class Latency:
+    def __init__(self, rest_ms: float = 50, connect_ms: float = 400, move_ms: float = 150,
+                 download_ms: float = 80, frame_ms: float = 0, jitter: float = 0.2):
+        self.rest_ms = rest_ms
+        self.connect_ms = connect_ms
+        self.move_ms = move_ms
+        self.download_ms = download_ms
+        self.frame_ms = frame_ms
+        self.jitter = jitter
+
+    def sample(self, base_ms: float) -> float:
+        if base_ms <= 0:
+            return 0.0
+        return base_ms * random.uniform(1 - self.jitter, 1 + self.jitter) / 1000
+
+    async def rest(self):
+        await asyncio.sleep(self.sample(self.rest_ms))
+
+    async def connect(self):
+        await asyncio.sleep(self.sample(self.connect_ms))
+
+    async def move(self):
+        await asyncio.sleep(self.sample(self.move_ms))
+
+
+class FakeUser:
+    def __init__(self, user_id: int, name: str, bot: bool = False):
+        self.id = user_id
+        self.name = name
+        self.display_name = name
+        self.bot = bot
+        self.mention = f"<@{user_id}>"
+
+    def __eq__(self, other):
+        return getattr(other, "id", None) == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class FakeVoiceState:
+    def __init__(self, channel: "FakeVoiceChannel"):
+        self.channel = channel
+
+
+class FakeMember(FakeUser):
+    def __init__(self, user_id: int, name: str, guild: "FakeGuild", administrator: bool = False):
+        super().__init__(user_id, name)
+        self.guild = guild
+        self.voice: FakeVoiceState | None = None
+        self.guild_permissions = discord.Permissions(administrator=administrator)
+
+
+class FakeReaction:
+    def __init__(self, emoji: str, me: bool):
+        self.emoji = emoji
+        self.me = me
+        self.count = 1
+
+
+class FakeMessage:
+    def __init__(self, channel: "FakeTextChannel", author: FakeUser, content: str = "",
+                 attachments: list | None = None):
+        self.id = next_id()
+        self.channel = channel
+        self.author = author
+        self.content = content
+        self.attachments = attachments or []
+        self.reactions: list[FakeReaction] = []
+        self.pinned = False
+
+    @property
+    def latency(self) -> Latency:
+        return self.channel.guild.latency
+
+    def _find(self, emoji) -> FakeReaction | None:
+        return next((r for r in self.reactions if r.emoji == str(emoji)), None)
+
+    async def add_reaction(self, emoji):
+        await self.latency.rest()
+        reaction = self._find(emoji)
+        if reaction:
+            reaction.me = True
+        else:
+            self.reactions.append(FakeReaction(str(emoji), me=True))
+
+    async def clear_reaction(self, emoji):
+        await self.latency.rest()
+        self.reactions = [r for r in self.reactions if r.emoji != str(emoji)]
+
+    async def remove_reaction(self, emoji, member):
+        await self.latency.rest()
+        reaction = self._find(emoji)
+        if not reaction:
+            return
+        if member.id == self.channel.guild.bot_user.id:
+            reaction.me = False
+        reaction.count -= 1
+        if reaction.count <= 0:
+            self.reactions.remove(reaction)
+
+    async def pin(self):
+        await self.latency.rest()
+        self.pinned = True
+
+    async def reply(self, content: str, **kwargs):
+        return await self.channel.send(content)
+
+
+class FakeTextChannel:
+    def __init__(self, guild: "FakeGuild", name: str):
+        self.id = next_id()
+        self.guild = guild
+        self.name = name
+        self.messages: dict[int, FakeMessage] = {}
+        self.sent = 0
+
+    async def send(self, content: str = "", **kwargs) -> FakeMessage:
+        await self.guild.latency.rest()
+        self.sent += 1
+        message = FakeMessage(self, self.guild.bot_user, content)
+        self.messages[message.id] = message
+        return message
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        await self.guild.latency.rest()
+        message = self.messages.get(message_id)
+        if not message:
+            raise discord.NotFound(_FakeResponse(404), "Unknown Message")
+        return message
+
+    async def pins(self) -> list[FakeMessage]:
+        await self.guild.latency.rest()
+        return [m for m in self.messages.values() if m.pinned]
+
+    def get_partial_message(self, message_id: int) -> FakeMessage:
+        return self.messages[message_id]
+
+
+class _FakeResponse:
+    def __init__(self, status: int):
+        self.status = status
+        self.reason = "Fake"
+
+
+class FakeVoiceClient:
+    def __init__(self, guild: "FakeGuild", channel: "FakeVoiceChannel"):
+        self.guild = guild
+        self.channel = channel
+        self._connected = True
+        self._player: threading.Thread | None = None
+        self._stop = threading.Event()
+        self.plays = 0
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def is_playing(self) -> bool:
+        return self._player is not None and self._player.is_alive() and not self._stop.is_set()
+
+    def play(self, source: discord.AudioSource, *, after=None):
+        if self.is_playing():
+            raise discord.ClientException("Already playing audio.")
+        self.plays += 1
+        self._stop = threading.Event()
+        self._player = threading.Thread(
+            target=self._run, args=(source, after, self._stop, self.guild.loop), daemon=True
+        )
+        self._player.start()
+
+    def _run(self, source: discord.AudioSource, after, stop: threading.Event, loop: asyncio.AbstractEventLoop):
+        frame_delay = self.guild.latency.frame_ms / 1000
+        first = True
+        error = None
+        try:
+            while not stop.is_set():
+                data = source.read()
+                if first:
+                    first = False
+                    loop.call_soon_threadsafe(self.guild.first_packet, time.monotonic())
+                if not data:
+                    break
+                if frame_delay:
+                    time.sleep(frame_delay)
+        except Exception as e:
+            error = e
+        finally:
+            source.cleanup()
+            if after:
+                after(error)
+
+    def stop(self):
+        self._stop.set()
+
+    async def move_to(self, channel: "FakeVoiceChannel"):
+        await self.guild.latency.move()
+        self.channel = channel
+
+    async def disconnect(self, force: bool = False):
+        self.stop()
+        self._connected = False
+        if self.guild.voice_client is self:
+            self.guild.voice_client = None
+
+
+class FakeVoiceChannel:
+    def __init__(self, guild: "FakeGuild", name: str):
+        self.id = next_id()
+        self.guild = guild
+        self.name = name
+        self.rtc_region = None
+        self.members: list[FakeMember] = []
+
+    async def connect(self, timeout: float = 60.0) -> FakeVoiceClient:
+        await self.guild.latency.connect()
+        vc = FakeVoiceClient(self.guild, self)
+        self.guild.voice_client = vc
+        return vc
+
+
+class FakeGuild:
+    def __init__(self, bot_user: FakeUser, latency: Latency, members: int = 5):
+        self.id = next_id()
+        self.name = f"bench-{self.id}"
+        self.bot_user = bot_user
+        self.latency = latency
+        self.loop = asyncio.get_running_loop()
+        self.voice_client: FakeVoiceClient | None = None
+        self.board = FakeTextChannel(self, "reactasound")
+        self.text_channels = [self.board]
+        self.threads = []
+        self.voice_channel = FakeVoiceChannel(self, "General")
+        self._channels = {self.board.id: self.board, self.voice_channel.id: self.voice_channel}
+        self.members: dict[int, FakeMember] = {}
+        for index in range(members):
+            member = FakeMember(next_id(), f"user{index}", self, administrator=index == 0)
+            member.voice = FakeVoiceState(self.voice_channel)
+            self.members[member.id] = member
+        self._packet_waiters: deque[asyncio.Future] = deque()
+
+    def get_channel(self, channel_id: int):
+        return self._channels.get(channel_id)
+
+    def get_member(self, user_id: int) -> FakeMember | None:
+        return self.members.get(user_id)
+
+    def expect_packet(self) -> asyncio.Future:
+        future = self.loop.create_future()
+        self._packet_waiters.append(future)
+        return future
+
+    def first_packet(self, at: float):
+        while self._packet_waiters:
+            future = self._packet_waiters.popleft()
+            if not future.done():
+                future.set_result(at)
+                return
+
+
+class FakeFollowup:
+    async def send(self, content: str, **kwargs):
+        pass
+
+
+class FakeContext:
+    def __init__(self, guild: FakeGuild, author: FakeMember, channel: FakeTextChannel):
+        self.guild = guild
+        self.author = author
+        self.channel = channel
+        self.followup = FakeFollowup()
+
+    async def respond(self, content: str, **kwargs):
+        await self.guild.latency.rest()
+
+
+class FakeAttachment:
+    def __init__(self, filename: str, url: str, size: int):
+        self.id = next_id()
+        self.filename = filename
+        self.url = url
+        self.size = size
+
+
+class FakePayload:
+    def __init__(self, guild: FakeGuild, message_id: int, member: FakeMember, emoji: str):
+        self.guild_id = guild.id
+        self.channel_id = guild.board.id
+        self.message_id = message_id
+        self.user_id = member.id
+        self.member = member
+        self.emoji = discord.PartialEmoji(name=emoji)
+
+
+class FakeBot:
+    def __init__(self):
+        self.user = FakeUser(next_id(), "ReactASound", bot=True)
+        self.guilds: dict[int, FakeGuild] = {}
+        self._replies: dict[int, deque[FakeMessage]] = {}
+
+    def add_guild(self, guild: FakeGuild):
+        self.guilds[guild.id] = guild
+
+    def get_guild(self, guild_id: int) -> FakeGuild | None:
+        return self.guilds.get(guild_id)
+
+    def queue_message(self, message: FakeMessage):
+        self._replies.setdefault(message.author.id, deque()).append(message)
+
+    async def wait_for(self, event: str, check=None, timeout: float | None = None):
+        for replies in self._replies.values():
+            for message in list(replies):
+                if check is None or check(message):
+                    replies.remove(message)
+                    await message.channel.guild.latency.rest()
+                    return message
+        raise asyncio.TimeoutError()
@@ -0,0 +1,46 @@
+import struct
+
+OPUS_SILENCE = b"\xf8\xff\xfe"
+FRAME_SAMPLES = 960
+SERIAL = 0x52415321
+
+
+def _crc_table() -> list[int]:
+    table = []
+    for index in range(256):
+        crc = index << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7) if crc & 0x80000000 else crc << 1
+        table.append(crc & 0xFFFFFFFF)
+    return table
+
+
+_CRC_TABLE = _crc_table()
+
+
+def _ogg_crc(data: bytes) -> int:
+    crc = 0
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFFFFFF) ^ _CRC_TABLE[((crc >> 24) & 0xFF) ^ byte]
+    return crc
+
+
+def _ogg_page(packet: bytes, sequence: int, granule: int, flags: int = 0) -> bytes:
+    segments = [255] * (len(packet) // 255) + [len(packet) % 255]
+    header = struct.pack("<4sBBqIIIB", b"OggS", 0, flags, granule, SERIAL, sequence, 0, len(segments))
+    page = header + bytes(segments) + packet
+    return page[:22] + struct.pack("<I", _ogg_crc(page)) + page[26:]
+
+
+def write_silent_opus(path: str, seconds: float):
+    head = b"OpusHead" + struct.pack("<BBHIhB", 1, 2, 312, 48000, 0, 0)
+    vendor = b"reactasound-bench"
+    tags = b"OpusTags" + struct.pack("<I", len(vendor)) + vendor + struct.pack("<I", 0)
+    frames = max(1, int(seconds * 50))
+
+    with open(path, "wb") as fp:
+        fp.write(_ogg_page(head, 0, 0, flags=0x02))
+        fp.write(_ogg_page(tags, 1, 0))
+        for index in range(frames):
+            flags = 0x04 if index == frames - 1 else 0
+            fp.write(_ogg_page(OPUS_SILENCE, index + 2, (index + 1) * FRAME_SAMPLES, flags))
@@ -0,0 +1,305 @@
+import os
+import shutil
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix="reactasound-bench-")
+os.environ["DATABASE_URL"] = os.getenv(
+    "BENCH_DATABASE_URL", f"sqlite+aiosqlite:///{os.path.join(WORKDIR, 'bench.db')}?timeout=30"
+)
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+from typing import Callable
+
+import numpy as np
+from aiohttp import web
+
+from benchmarks.fakes import (
+    Latency, FakeBot, FakeGuild, FakeMessage, FakeContext, FakeAttachment, FakePayload
+)
+from benchmarks.opus_fixture import write_silent_opus
+from database_util.db import Session, init_db
+from database_util.db_util import get_sound
+from database_util.models import EmojiSoundMap
+from interactions.add_sound import AddSoundFlow
+from interactions.on_reaction import handle_reaction
+from interactions.playback_scheduler import playback_scheduler, PLAYBACK_POLICIES
+from interactions.reaction_board import ReactionBoard
+from interactions.guild_registry import guild_registry
+from storage.sound_store import object_path
+from audio.mixer import MixerSource, MixerClip, FRAME_SAMPLES
+from audio.opus import OPUS_EXTENSION
+
+SCENARIOS = ("reaction", "board", "addsound", "mix")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(samples: list[float]) -> dict:
+    return {
+        "n": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2) if samples else float("nan"),
+    }
+
+
+def emoji_for(index: int) -> str:
+    return chr(0x1F300 + index)
+
+
+class SoundFixture:
+    def __init__(self, seconds: float):
+        source = os.path.join(WORKDIR, "fixture.opus")
+        write_silent_opus(source, seconds)
+        with open(source, "rb") as fp:
+            self.data = fp.read()
+        self.filename = hashlib.sha256(self.data).hexdigest() + OPUS_EXTENSION
+        self.duration_ms = int(seconds * 1000)
+
+        path = object_path(self.filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copyfile(source, path)
+
+
+class DownloadServer:
+    def __init__(self, fixture: SoundFixture, latency: Latency):
+        self.fixture = fixture
+        self.latency = latency
+        self.url = None
+        self._runner = None
+
+    async def _serve(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.latency.sample(self.latency.download_ms))
+        return web.Response(body=self.fixture.data, content_type="audio/ogg")
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/sound.opus", self._serve)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/sound.opus"
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+
+async def make_guilds(bot: FakeBot, count: int, emojis: int, fixture: SoundFixture, args) -> list[FakeGuild]:
+    latency = Latency(args.rest_ms, args.connect_ms, args.move_ms, args.download_ms, args.frame_ms, args.jitter)
+    guilds = [FakeGuild(bot.user, latency, members=args.members) for _ in range(count)]
+    async with Session() as session:
+        for guild in guilds:
+            bot.add_guild(guild)
+            session.add_all(
+                EmojiSoundMap(
+                    guild_id=guild.id,
+                    emoji=emoji_for(index),
+                    sound_filename=fixture.filename,
+                    uploader_id=bot.user.id,
+                    duration_ms=fixture.duration_ms
+                )
+                for index in range(emojis)
+            )
+        await session.commit()
+    return guilds
+
+
+async def bench_reactions(bot: FakeBot, guilds: list[FakeGuild], args) -> dict:
+    board = ReactionBoard(bot)
+    await asyncio.gather(*(board.update_reactions(guild) for guild in guilds))
+
+    cold, warm, timeouts = [], [], 0
+    throughputs = []
+
+    async def drive(guild: FakeGuild):
+        nonlocal timeouts
+        pinned_id = guild_registry.get(guild.id).pinned_message_id
+        members = list(guild.members.values())
+        played = 0
+        started = time.monotonic()
+        for index in range(args.reactions):
+            payload = FakePayload(guild, pinned_id, random.choice(members), emoji_for(random.randrange(args.emojis)))
+            packet = guild.expect_packet()
+            reacted_at = time.monotonic()
+            await handle_reaction(bot, payload)
+            try:
+                first_packet_at = await asyncio.wait_for(packet, timeout=args.timeout)
+            except asyncio.TimeoutError:
+                timeouts += 1
+                continue
+            played += 1
+            (cold if index == 0 else warm).append(first_packet_at - reacted_at)
+            if args.think_ms:
+                await asyncio.sleep(args.think_ms / 1000)
+        throughputs.append(played / (time.monotonic() - started))
+
+    wall_started = time.monotonic()
+    await asyncio.gather(*(drive(guild) for guild in guilds))
+    wall = time.monotonic() - wall_started
+
+    return {
+        "cold": summarize(cold),
+        "warm": summarize(warm),
+        "timeouts": timeouts,
+        "per_guild_per_s": round(sum(throughputs) / len(throughputs), 2),
+        "total_per_s": round((len(cold) + len(warm)) / wall, 2),
+    }
+
+
+async def bench_board(bot: FakeBot, guilds: list[FakeGuild], args) -> dict:
+    board = ReactionBoard(bot)
+    cold, warm, burst = [], [], []
+
+    async def timed(samples: list[float], guild: FakeGuild):
+        started = time.monotonic()
+        await board.update_reactions(guild)
+        samples.append(time.monotonic() - started)
+
+    await asyncio.gather(*(timed(cold, guild) for guild in guilds))
+    await asyncio.gather(*(timed(warm, guild) for guild in guilds))
+    await asyncio.gather(*(timed(burst, guild) for guild in guilds for _ in range(args.burst)))
+
+    return {"cold": summarize(cold), "warm": summarize(warm), "burst": summarize(burst)}
+
+
+async def bench_addsound(bot: FakeBot, guilds: list[FakeGuild], server: DownloadServer, args) -> dict:
+    flows, failures = [], 0
+
+    async def drive(guild: FakeGuild):
+        nonlocal failures
+        admin = next(member for member in guild.members.values() if member.guild_permissions.administrator)
+        for index in range(args.uploads):
+            emoji = emoji_for(args.emojis + index)
+            attachment = FakeAttachment("sound.opus", server.url, len(server.fixture.data))
+            bot.queue_message(FakeMessage(guild.board, admin, f"{emoji} please", [attachment]))
+
+            started = time.monotonic()
+            await AddSoundFlow(bot, FakeContext(guild, admin, guild.board)).start()
+            flows.append(time.monotonic() - started)
+            if not await get_sound(guild.id, emoji):
+                failures += 1
+
+    await asyncio.gather(*(drive(guild) for guild in guilds))
+    return {"flow": summarize(flows), "failures": failures}
+
+
+def tone_reader(seconds: float, frequency: float) -> Callable[[], bytes]:
+    samples = np.arange(int(seconds * 48000)) / 48000
+    pcm = np.repeat((np.sin(2 * np.pi * frequency * samples) * 8000).astype(np.int16), 2).tobytes()
+    frame_bytes = FRAME_SAMPLES * 2
+    chunks = iter([pcm[offset:offset + frame_bytes] for offset in range(0, len(pcm), frame_bytes)])
+    return lambda: next(chunks, b"")
+
+
+async def bench_mixer(guilds: list[FakeGuild], args) -> dict:
+    mixers = [MixerSource(max_clips=args.mix_clips) for _ in guilds]
+    for mixer in mixers:
+        for index in range(args.mix_clips):
+            mixer.add(MixerClip(tone_reader(args.clip_seconds, 220 + 55 * index)))
+
+    frames, ticks = [], []
+    while any(mixer.has_clips() for mixer in mixers):
+        tick_started = time.perf_counter()
+        for mixer in mixers:
+            started = time.perf_counter()
+            mixer.read()
+            frames.append(time.perf_counter() - started)
+        ticks.append(time.perf_counter() - tick_started)
+
+    return {"frame": summarize(frames), "tick": summarize(ticks), "clips": args.mix_clips}
+
+
+def report(scenario: str, guild_count: int, result: dict):
+    parts = []
+    for key, value in result.items():
+        if isinstance(value, dict):
+            parts.append(f"{key}[n={value['n']} p50={value['p50_ms']}ms p99={value['p99_ms']}ms]")
+        else:
+            parts.append(f"{key}={value}")
+    print(f"{scenario:<9} guilds={guild_count:<5} " + " ".join(parts), flush=True)
+
+
+async def main(args):
+    shutil.copytree(os.path.join(REPO_ROOT, "assets"), os.path.join(WORKDIR, "assets"))
+    os.chdir(WORKDIR)
+    random.seed(args.seed)
+    playback_scheduler.policy = args.policy
+
+    await init_db()
+    fixture = SoundFixture(args.clip_seconds)
+    latency = Latency(download_ms=args.download_ms, jitter=args.jitter)
+    server = DownloadServer(fixture, latency)
+    await server.start()
+
+    bot = FakeBot()
+    results = []
+    try:
+        for guild_count in args.guilds:
+            for scenario in args.scenarios:
+                guilds = await make_guilds(bot, guild_count, args.emojis, fixture, args)
+                if scenario == "reaction":
+                    result = await bench_reactions(bot, guilds, args)
+                elif scenario == "board":
+                    result = await bench_board(bot, guilds, args)
+                elif scenario == "mix":
+                    result = await bench_mixer(guilds, args)
+                else:
+                    result = await bench_addsound(bot, guilds, server, args)
+                report(scenario, guild_count, result)
+                results.append({"scenario": scenario, "guilds": guild_count, **result})
+    finally:
+        await server.stop()
+
+    if args.json:
+        with open(os.path.join(REPO_ROOT, args.json), "w") as fp:
+            json.dump({"args": vars(args), "results": results}, fp, indent=2)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline ReactASound benchmarks against fake Discord objects.")
+    parser.add_argument("--guilds", type=lambda v: [int(n) for n in v.split(",")], default=[1, 10, 50],
+                        help="Comma-separated guild counts to run each scenario with.")
+    parser.add_argument("--scenarios", type=lambda v: v.split(","), default=list(SCENARIOS))
+    parser.add_argument("--policy", choices=PLAYBACK_POLICIES, default=playback_scheduler.policy)
+    parser.add_argument("--reactions", type=int, default=20, help="Reactions per guild.")
+    parser.add_argument("--uploads", type=int, default=3, help="/addsound flows per guild.")
+    parser.add_argument("--burst", type=int, default=5, help="Concurrent board updates per guild.")
+    parser.add_argument("--emojis", type=int, default=10, help="Mapped emojis per guild.")
+    parser.add_argument("--members", type=int, default=5, help="Members in voice per guild.")
+    parser.add_argument("--mix-clips", type=int, default=12, help="Simultaneous clips per guild in the mix scenario.")
+    parser.add_argument("--clip-seconds", type=float, default=1.0)
+    parser.add_argument("--rest-ms", type=float, default=50)
+    parser.add_argument("--connect-ms", type=float, default=400)
+    parser.add_argument("--move-ms", type=float, default=150)
+    parser.add_argument("--download-ms", type=float, default=80)
+    parser.add_argument("--frame-ms", type=float, default=0,
+                        help="Delay between Opus frames in the fake player; 20 plays in real time.")
+    parser.add_argument("--think-ms", type=float, default=0, help="Pause between a guild's reactions.")
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write results to this path, relative to the repository root.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    try:
+        asyncio.run(main(parse_args()))
+    finally:
+        shutil.rmtree(WORKDIR, ignore_errors=True)
@@ -1,39 +1,143 @@
 import discord
 import os
+import time
+import asyncio
 import logging
 from dotenv import load_dotenv
 
 from interactions.add_sound import AddSoundFlow
-from interactions.remove_sound import DeleteSound
+from interactions.remove_sound import DeleteSound, autocomplete_mapped_emojis
+from interactions.import_sounds import ImportSounds
+from interactions.export_sounds import ExportSounds
 from interactions.on_reaction import handle_reaction
 from interactions.reaction_board import ReactionBoard
-from database_util.db_util import get_pinned_message_id
+from database_util.db import init_db
+from database_util.db_util import get_pinned_message_id, load_all_mappings, get_all_pinned_message_ids
+from database_util.cache import mapping_cache
+from database_util.invalidation_bus import invalidation_bus
+from interactions.guild_registry import guild_registry
+from interactions.voice_prewarm import voice_prewarmer
 from logs.log_config import setup_logging
+from monitoring.metrics_server import start_metrics_server
 
 setup_logging()
 load_dotenv()
 
+LEAN_GATEWAY = os.getenv("LEAN_GATEWAY", "false").lower() in ("1", "true", "yes")
+
 intents = discord.Intents.default()
 intents.guilds = True
-intents.members = True
-intents.message_content = True
+intents.members = not LEAN_GATEWAY
+intents.message_content = not LEAN_GATEWAY
 intents.voice_states = True
 
-bot = discord.Bot(intents=intents)
+bot_options = {"intents": intents}
+if LEAN_GATEWAY:
+    member_cache_flags = discord.MemberCacheFlags.none()
+    member_cache_flags.voice = True
+    bot_options["member_cache_flags"] = member_cache_flags
+    bot_options["chunk_guilds_at_startup"] = False
+
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))
+SHARD_IDS = [int(shard_id) for shard_id in os.getenv("SHARD_IDS", "").split(",") if shard_id.strip()]
+SHARD_HEALTH_INTERVAL = float(os.getenv("SHARD_HEALTH_INTERVAL", "60"))
+
+if SHARD_COUNT:
+    bot = discord.AutoShardedBot(shard_count=SHARD_COUNT, shard_ids=SHARD_IDS or None, **bot_options)
+else:
+    bot = discord.Bot(**bot_options)
+
+STARTUP_CONCURRENCY = int(os.getenv("STARTUP_CONCURRENCY", "5"))
+_warmed_up = False
 
 @bot.event
 async def on_ready():
+    global _warmed_up
     logging.info(f'Bot is ready! Logged in as {bot.user}')
+    await start_metrics_server()
+    if not _warmed_up:
+        _warmed_up = True
+        if isinstance(bot, discord.AutoShardedBot):
+            asyncio.create_task(log_shard_health())
+        await invalidation_bus.start()
+        await warm_up()
+
+@bot.event
+async def on_shard_connect(shard_id: int):
+    logging.info(f"[Shard {shard_id}] Connected to the gateway")
+
+@bot.event
+async def on_shard_ready(shard_id: int):
+    guilds = sum(1 for guild in bot.guilds if guild.shard_id == shard_id)
+    logging.info(f"[Shard {shard_id}] Ready with {guilds} guild(s)")
+
+@bot.event
+async def on_shard_resumed(shard_id: int):
+    logging.info(f"[Shard {shard_id}] Resumed session")
+
+@bot.event
+async def on_shard_disconnect(shard_id: int):
+    logging.warning(f"[Shard {shard_id}] Disconnected from the gateway")
+
+async def log_shard_health():
+    while not bot.is_closed():
+        for shard_id, latency in bot.latencies:
+            guilds = sum(1 for guild in bot.guilds if guild.shard_id == shard_id)
+            voice = sum(1 for vc in bot.voice_clients if vc.guild.shard_id == shard_id)
+            logging.info(
+                f"[Shard {shard_id}] latency={latency * 1000:.0f}ms guilds={guilds} voice={voice} "
+                f"closed={bot.get_shard(shard_id).is_closed()}"
+            )
+        await asyncio.sleep(SHARD_HEALTH_INTERVAL)
+
+async def warm_up():
+    started = time.monotonic()
+    await init_db()
+
+    guilds = list(bot.guilds)
+    generations = {guild.id: mapping_cache.generation(guild.id) for guild in guilds}
+    mappings = await load_all_mappings()
+    pinned = await get_all_pinned_message_ids()
+    for guild in guilds:
+        if mapping_cache.peek(guild.id) is None and mapping_cache.generation(guild.id) == generations[guild.id]:
+            mapping_cache.store(guild.id, mappings.get(guild.id, {}))
+        state = guild_registry.get(guild.id)
+        if guild.id in pinned and not (state and state.pinned_message_id):
+            guild_registry.set_pinned_message(guild.id, pinned[guild.id])
+    logging.info(
+        f"[Startup] Loaded mappings and pinned messages for {len(guilds)} guild(s) "
+        f"in {time.monotonic() - started:.2f}s"
+    )
+
+    semaphore = asyncio.Semaphore(STARTUP_CONCURRENCY)
+    progress_step = max(1, len(guilds) // 10)
+    done = 0
+    failed = 0
+
+    async def reconcile(guild: discord.Guild):
+        nonlocal done, failed
+        async with semaphore:
+            if not await ensure_pinned_message_and_thread(guild, bot):
+                failed += 1
+        done += 1
+        if done % progress_step == 0 or done == len(guilds):
+            logging.info(f"[Startup] Reconciled {done}/{len(guilds)} guild(s), {failed} failed")
+
+    await asyncio.gather(*(reconcile(guild) for guild in guilds))
+    logging.info(f"[Startup] Warm-up finished in {time.monotonic() - started:.2f}s")
 
 @bot.event
 async def on_guild_join(guild):
+    guild_registry.remove(guild.id)
     existing = discord.utils.get(guild.text_channels, name="reactasound")
     if existing:
+        guild_registry.set_channel(guild.id, existing.id)
         logging.info(f"'reactasound' channel already exists in {guild.name}")
         return
 
     try:
         channel = await guild.create_text_channel("reactasound", reason="ReactASound bot setup")
+        guild_registry.set_channel(guild.id, channel.id)
         logging.info(f"Created 'reactasound' channel in {guild.name}")
 
         setup_msg = (
@@ -44,12 +148,15 @@ async def on_guild_join(guild):
         message = await channel.send(setup_msg)
 
         thread = await message.create_thread(name="botcommands", auto_archive_duration=60)
+        guild_registry.set_thread(guild.id, thread.id)
         logging.info(f"Created thread 'botcommands' in {guild.name}")
 
         commands_guide = (
             "**Bot Commands Guide:**\n\n"
             "🔧 `/addsound` — Bind an emoji to a sound file by uploading it.\n"
             "🗑️ `/removesound` — Remove an emoji-to-sound binding.\n"
+            "📦 `/exportsounds` — Download the soundboard as a zip archive.\n"
+            "📥 `/importsounds` — Bind all sounds from an exported zip archive.\n"
             "❓ Ask any questions here!\n\n"
             "Enjoy! 🎶"
         )
@@ -63,21 +170,47 @@ async def on_guild_join(guild):
     except Exception as e:
         logging.error(f"Error during guild join setup in {guild.name}: {e}")
 
-@bot.slash_command(description="Bind an emoji to a sound file by uploading a file in a message")
-async def addsound(ctx: discord.ApplicationContext):
+@bot.slash_command(description="Bind an emoji to a sound file by uploading it")
+async def addsound(
+    ctx: discord.ApplicationContext,
+    emoji: discord.Option(str, "The emoji to bind", required=LEAN_GATEWAY),
+    sound: discord.Option(discord.Attachment, "The sound file to play", required=LEAN_GATEWAY)
+):
     handler = AddSoundFlow(bot, ctx)
-    await handler.start()
+    await handler.start(emoji, sound)
 
-@bot.slash_command(description="Remove an emoji-to-sound binding by choosing from a list")
-async def removesound(ctx: discord.ApplicationContext):
+@bot.slash_command(description="Remove an emoji-to-sound binding")
+async def removesound(
+    ctx: discord.ApplicationContext,
+    emoji: discord.Option(
+        str, "The emoji to unbind", autocomplete=autocomplete_mapped_emojis, required=LEAN_GATEWAY
+    )
+):
     handler = DeleteSound(bot, ctx)
+    await handler.start(emoji)
+
+@bot.slash_command(description="Download the soundboard as a zip archive")
+async def exportsounds(ctx: discord.ApplicationContext):
+    handler = ExportSounds(bot, ctx)
     await handler.start()
 
+@bot.slash_command(description="Bind all sounds from an exported zip archive")
+async def importsounds(
+    ctx: discord.ApplicationContext,
+    archive: discord.Option(discord.Attachment, "A zip archive with a manifest.json")
+):
+    handler = ImportSounds(bot, ctx)
+    await handler.start(archive)
+
 @bot.event
 async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
     await handle_reaction(bot, payload)
 
-async def recreate_pinned_message_and_thread(guild: discord.Guild, bot: discord.Bot):
+@bot.event
+async def on_voice_state_update(member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
+    await voice_prewarmer.on_voice_state_update(member, before, after)
+
+async def ensure_pinned_message_and_thread(guild: discord.Guild, bot: discord.Bot) -> bool:
     reaction_board = ReactionBoard(bot)
     try:
         message = await reaction_board.get_or_create_pinned_message(guild)
@@ -93,20 +226,33 @@ async def recreate_pinned_message_and_thread(guild: discord.Guild, bot: discord.
                 "**Bot Commands Guide:**\n\n"
                 "🔧 `/addsound` — Bind an emoji to a sound file by uploading it.\n"
                 "🗑️ `/removesound` — Remove an emoji-to-sound binding.\n"
+                "📦 `/exportsounds` — Download the soundboard as a zip archive.\n"
+                "📥 `/importsounds` — Bind all sounds from an exported zip archive.\n"
                 "❓ Ask any questions here!\n\n"
                 "Enjoy! 🎶"
             )
             await thread.send(commands_guide)
             logging.info(f"Created missing 'botcommands' thread in {guild.name}")
 
+        guild_registry.set_thread(guild.id, thread.id)
+
         await reaction_board.update_reactions(guild)
-        logging.info(f"Recreated pinned message and ensured thread in {guild.name}")
+        logging.info(f"Ensured pinned message and thread in {guild.name}")
+        return True
 
     except Exception as e:
-        logging.error(f"Failed to recreate pinned message or thread in {guild.name}: {e}")
+        logging.error(f"Failed to ensure pinned message or thread in {guild.name}: {e}")
+        return False
 
 @bot.event
 async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent):
+    if payload.guild_id is None:
+        return
+
+    state = guild_registry.get(payload.guild_id)
+    if state and state.channel_id and state.channel_id != payload.channel_id:
+        return
+
     guild = bot.get_guild(payload.guild_id)
     if not guild:
         return
@@ -115,10 +261,15 @@ async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent):
     if not channel or channel.name != "reactasound":
         return
 
-    pinned_msg_id = await get_pinned_message_id(guild.id)
+    if state and state.pinned_message_id:
+        pinned_msg_id = state.pinned_message_id
+    else:
+        pinned_msg_id = await get_pinned_message_id(guild.id)
+
     if pinned_msg_id == payload.message_id:
         logging.info(f"Pinned message deleted in {guild.name}, recreating...")
-        await recreate_pinned_message_and_thread(guild, bot)
+        guild_registry.set_pinned_message(guild.id, None)
+        await ensure_pinned_message_and_thread(guild, bot)
 
 @bot.event
 async def on_thread_delete(thread: discord.Thread):
@@ -126,7 +277,25 @@ async def on_thread_delete(thread: discord.Thread):
         guild = thread.guild
         if guild:
             logging.info(f"'botcommands' thread deleted in {guild.name}, recreating...")
-            await recreate_pinned_message_and_thread(guild, bot)
+            guild_registry.set_thread(guild.id, None)
+            await ensure_pinned_message_and_thread(guild, bot)
+
+@bot.event
+async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
+    state = guild_registry.get(channel.guild.id)
+    if state and state.channel_id == channel.id:
+        guild_registry.remove(channel.guild.id)
+
+@bot.event
+async def on_guild_channel_create(channel: discord.abc.GuildChannel):
+    if isinstance(channel, discord.TextChannel) and channel.name == "reactasound":
+        if guild_registry.is_channel_missing(channel.guild.id):
+            logging.info(f"'reactasound' channel created in {channel.guild.name}")
+            guild_registry.remove(channel.guild.id)
+
+@bot.event
+async def on_guild_remove(guild: discord.Guild):
+    guild_registry.remove(guild.id)
 
 @bot.event
 async def on_error(event, *args, **kwargs):
@@ -0,0 +1,72 @@
+import asyncio
+
+
+class CachedSound:
+    def __init__(self, filename: str, duration_ms: int | None = None):
+        self.filename = filename
+        self.duration_ms = duration_ms
+
+
+class MappingCache:
+    def __init__(self):
+        self._guilds: dict[int, dict[str, CachedSound]] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._generations: dict[int, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, guild_id: int) -> dict[str, CachedSound] | None:
+        mappings = self._guilds.get(guild_id)
+        if mappings is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return mappings
+
+    def peek(self, guild_id: int) -> dict[str, CachedSound] | None:
+        return self._guilds.get(guild_id)
+
+    def load_lock(self, guild_id: int) -> asyncio.Lock:
+        return self._locks.setdefault(guild_id, asyncio.Lock())
+
+    def generation(self, guild_id: int) -> tuple[int, int]:
+        return self._epoch, self._generations.get(guild_id, 0)
+
+    def _bump(self, guild_id: int):
+        self._generations[guild_id] = self._generations.get(guild_id, 0) + 1
+
+    def store(self, guild_id: int, mappings: dict[str, CachedSound]):
+        self._guilds[guild_id] = mappings
+
+    def set(self, guild_id: int, emoji: str, sound: CachedSound):
+        self._bump(guild_id)
+        mappings = self._guilds.get(guild_id)
+        if mappings is not None:
+            mappings[emoji] = sound
+
+    def discard(self, guild_id: int, emoji: str):
+        self._bump(guild_id)
+        mappings = self._guilds.get(guild_id)
+        if mappings is not None:
+            mappings.pop(emoji, None)
+
+    def invalidate(self, guild_id: int | None = None):
+        if guild_id is None:
+            self._epoch += 1
+            self._guilds.clear()
+        else:
+            self._bump(guild_id)
+            self._guilds.pop(guild_id, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "guilds": len(self._guilds),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+mapping_cache = MappingCache()
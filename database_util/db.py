@@ -1,15 +1,56 @@
 from dotenv import load_dotenv
+from sqlalchemy import text, inspect
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from database_util.models import Base
+from database_util.models import Base, EmojiSoundMap
+import hashlib
 import os
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
 
-engine = create_async_engine(DATABASE_URL, echo=False)
+def _engine_options(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+
+engine = create_async_engine(DATABASE_URL, echo=False, **_engine_options(DATABASE_URL))
 Session = async_sessionmaker(engine, expire_on_commit=False)
 
+def advisory_key(name: str) -> int:
+    return int.from_bytes(hashlib.sha256(name.encode()).digest()[:8], "big", signed=True)
+
+async def advisory_xact_lock(conn, *keys: int):
+    if engine.dialect.name != "postgresql":
+        return
+    for key in sorted(set(keys)):
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": key})
+
 async def init_db():
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await advisory_xact_lock(conn, advisory_key("init_db"))
+        await conn.run_sync(Base.metadata.create_all)
+        if engine.dialect.name == "postgresql":
+            await conn.execute(text("ALTER TABLE emoji_sound_map ADD COLUMN IF NOT EXISTS duration_ms INTEGER"))
+            await conn.execute(text("ALTER TABLE emoji_sound_map ADD COLUMN IF NOT EXISTS loudness_lufs FLOAT"))
+
+        indexes = await conn.run_sync(
+            lambda sync_conn: {index["name"] for index in inspect(sync_conn).get_indexes("emoji_sound_map")}
+        )
+        if "ix_emoji_sound_map_guild_emoji" not in indexes:
+            await conn.execute(text(
+                "DELETE FROM emoji_sound_map WHERE id NOT IN "
+                "(SELECT MAX(id) FROM emoji_sound_map GROUP BY guild_id, emoji)"
+            ))
+        for index in EmojiSoundMap.__table__.indexes:
+            if index.name not in indexes:
+                await conn.run_sync(index.create)
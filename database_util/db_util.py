@@ -1,43 +1,188 @@
-from database_util.db import Session
+from database_util.db import Session, engine, advisory_key, advisory_xact_lock
+from database_util.cache import mapping_cache, CachedSound
+from database_util.invalidation_bus import invalidation_bus
+from audio.frame_cache import frame_cache
 from database_util.models import EmojiSoundMap
 from database_util.models import GuildPinnedMessage
-from sqlalchemy import select
+from sqlalchemy import select, delete, func
 from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Awaitable, Callable
 
-async def add_or_update_mapping(guild_id, emoji, filename, uploader_id):
+def sound_lock_key(filename: str) -> int:
+    return advisory_key(f"sound:{filename}")
+
+def _insert(table):
+    if engine.dialect.name == "sqlite":
+        return sqlite_insert(table)
+    return pg_insert(table)
+
+async def _get_guild_mappings(guild_id: int) -> dict[str, CachedSound]:
+    mappings = mapping_cache.get(guild_id)
+    if mappings is not None:
+        return mappings
+
+    async with mapping_cache.load_lock(guild_id):
+        mappings = mapping_cache.peek(guild_id)
+        if mappings is not None:
+            return mappings
+
+        generation = mapping_cache.generation(guild_id)
+        async with Session() as session:
+            result = await session.execute(
+                select(EmojiSoundMap.emoji, EmojiSoundMap.sound_filename, EmojiSoundMap.duration_ms)
+                .where(EmojiSoundMap.guild_id == guild_id)
+                .order_by(EmojiSoundMap.id)
+            )
+            mappings = {
+                emoji: CachedSound(filename, duration_ms)
+                for emoji, filename, duration_ms in result.all()
+            }
+
+        if mapping_cache.generation(guild_id) == generation:
+            mapping_cache.store(guild_id, mappings)
+        return mappings
+
+async def load_all_mappings() -> dict[int, dict[str, CachedSound]]:
     async with Session() as session:
-        existing = await session.scalar(
-            select(EmojiSoundMap).where(EmojiSoundMap.guild_id == guild_id, EmojiSoundMap.emoji == emoji)
+        result = await session.execute(
+            select(EmojiSoundMap.guild_id, EmojiSoundMap.emoji, EmojiSoundMap.sound_filename, EmojiSoundMap.duration_ms)
+            .order_by(EmojiSoundMap.guild_id, EmojiSoundMap.id)
         )
+        rows = result.all()
 
-        if existing:
-            existing.sound_filename = filename
-        else:
-            session.add(EmojiSoundMap(
-                guild_id=guild_id,
-                emoji=emoji,
-                sound_filename=filename,
-                uploader_id=uploader_id
-            ))
+    mappings: dict[int, dict[str, CachedSound]] = {}
+    for guild_id, emoji, filename, duration_ms in rows:
+        mappings.setdefault(guild_id, {})[emoji] = CachedSound(filename, duration_ms)
+    return mappings
+
+async def _upsert_mapping(session, guild_id, emoji, filename, uploader_id, duration_ms, loudness_lufs):
+    stmt = _insert(EmojiSoundMap).values(
+        guild_id=guild_id,
+        emoji=emoji,
+        sound_filename=filename,
+        uploader_id=uploader_id,
+        duration_ms=duration_ms,
+        loudness_lufs=loudness_lufs
+    ).on_conflict_do_update(
+        index_elements=[EmojiSoundMap.guild_id, EmojiSoundMap.emoji],
+        set_={"sound_filename": filename, "duration_ms": duration_ms, "loudness_lufs": loudness_lufs}
+    )
+    previous_query = select(EmojiSoundMap.sound_filename).where(
+        EmojiSoundMap.guild_id == guild_id,
+        EmojiSoundMap.emoji == emoji
+    )
+
+    if engine.dialect.name == "sqlite":
+        previous = await session.scalar(previous_query)
+        await session.execute(stmt)
+    else:
+        previous_cte = previous_query.cte("previous")
+        previous = await session.scalar(
+            stmt.add_cte(previous_cte).returning(select(previous_cte.c.sound_filename).scalar_subquery())
+        )
+    await invalidation_bus.publish(
+        session, "mapping",
+        guild_id=guild_id, emoji=emoji, filename=filename, previous=previous, duration_ms=duration_ms
+    )
+    return previous
 
+async def _cache_mapping(guild_id, emoji, filename, duration_ms, previous):
+    async with mapping_cache.load_lock(guild_id):
+        mapping_cache.set(guild_id, emoji, CachedSound(filename, duration_ms))
+    frame_cache.discard(guild_id, filename)
+    if previous:
+        frame_cache.discard(guild_id, previous)
+
+async def add_or_update_mapping(guild_id, emoji, filename, uploader_id, duration_ms=None, loudness_lufs=None,
+                                verify: Callable[[], Awaitable[None]] | None = None):
+    async with Session() as session:
+        await advisory_xact_lock(session, sound_lock_key(filename))
+        if verify:
+            await verify()
+        previous = await _upsert_mapping(session, guild_id, emoji, filename, uploader_id, duration_ms, loudness_lufs)
         await session.commit()
 
-async def get_sound_filename(guild_id, emoji):
+    await _cache_mapping(guild_id, emoji, filename, duration_ms, previous)
+    return previous
+
+async def add_or_update_mappings(guild_id: int, uploader_id: int,
+                                 sounds: list[tuple[str, str, int | None, float | None]],
+                                 verify: Callable[[], Awaitable[None]] | None = None) -> list[str | None]:
     async with Session() as session:
-        row = await session.scalar(
-            select(EmojiSoundMap.sound_filename).where(
+        await advisory_xact_lock(session, *(sound_lock_key(filename) for _, filename, _, _ in sounds))
+        if verify:
+            await verify()
+        previous = [
+            await _upsert_mapping(session, guild_id, emoji, filename, uploader_id, duration_ms, loudness_lufs)
+            for emoji, filename, duration_ms, loudness_lufs in sounds
+        ]
+        await session.commit()
+
+    for (emoji, filename, duration_ms, _), previous_filename in zip(sounds, previous):
+        await _cache_mapping(guild_id, emoji, filename, duration_ms, previous_filename)
+    return previous
+
+async def delete_mapping(guild_id: int, emoji: str) -> str | None:
+    async with Session() as session:
+        filename = await session.scalar(
+            delete(EmojiSoundMap).where(
                 EmojiSoundMap.guild_id == guild_id,
                 EmojiSoundMap.emoji == emoji
-            )
+            ).returning(EmojiSoundMap.sound_filename)
         )
-        return row
+        if filename:
+            await invalidation_bus.publish(
+                session, "mapping",
+                guild_id=guild_id, emoji=emoji, filename=None, previous=filename, duration_ms=None
+            )
+        await session.commit()
+    if not filename:
+        return None
 
-async def get_all_emojis_for_guild(guild_id: int) -> list[str]:
+    async with mapping_cache.load_lock(guild_id):
+        mapping_cache.discard(guild_id, emoji)
+    frame_cache.discard(guild_id, filename)
+    return filename
+
+async def get_sound_metadata(filename: str) -> tuple[int, float | None] | None:
     async with Session() as session:
-        result = await session.scalars(
-            select(EmojiSoundMap.emoji).where(EmojiSoundMap.guild_id == guild_id)
-        )
-        return result.all()
+        row = (await session.execute(
+            select(EmojiSoundMap.duration_ms, EmojiSoundMap.loudness_lufs).where(
+                EmojiSoundMap.sound_filename == filename,
+                EmojiSoundMap.duration_ms.is_not(None)
+            ).limit(1)
+        )).first()
+        return tuple(row) if row else None
+
+async def delete_unreferenced_sound(filename: str, guild_id: int | None,
+                                    delete_file: Callable[[], Awaitable[None]]) -> int:
+    query = select(func.count()).select_from(EmojiSoundMap).where(EmojiSoundMap.sound_filename == filename)
+    if guild_id is not None:
+        query = query.where(EmojiSoundMap.guild_id == guild_id)
+    async with Session() as session:
+        await advisory_xact_lock(session, sound_lock_key(filename))
+        references = await session.scalar(query)
+        if not references:
+            await delete_file()
+        await session.commit()
+    return references
+
+async def get_sound(guild_id: int, emoji: str) -> CachedSound | None:
+    mappings = await _get_guild_mappings(guild_id)
+    return mappings.get(emoji)
+
+async def get_sound_filename(guild_id, emoji):
+    sound = await get_sound(guild_id, emoji)
+    return sound.filename if sound else None
+
+async def get_all_emojis_for_guild(guild_id: int) -> list[str]:
+    mappings = await _get_guild_mappings(guild_id)
+    return list(mappings)
+
+async def get_all_sounds_for_guild(guild_id: int) -> list[tuple[str, CachedSound]]:
+    mappings = await _get_guild_mappings(guild_id)
+    return list(mappings.items())
 
 async def get_pinned_message_id(guild_id: int) -> int | None:
     async with Session() as session:
@@ -46,9 +191,16 @@ async def get_pinned_message_id(guild_id: int) -> int | None:
         )
         return row
 
+async def get_all_pinned_message_ids() -> dict[int, int]:
+    async with Session() as session:
+        result = await session.execute(
+            select(GuildPinnedMessage.guild_id, GuildPinnedMessage.pinned_message_id)
+        )
+        return dict(result.all())
+
 async def upsert_pinned_message_id(guild_id: int, pinned_message_id: int):
     async with Session() as session:
-        stmt = pg_insert(GuildPinnedMessage).values(
+        stmt = _insert(GuildPinnedMessage).values(
             guild_id=guild_id,
             pinned_message_id=pinned_message_id
         ).on_conflict_do_update(
@@ -56,4 +208,23 @@ async def upsert_pinned_message_id(guild_id: int, pinned_message_id: int):
             set_={"pinned_message_id": pinned_message_id}
         )
         await session.execute(stmt)
-        await session.commit()
\ No newline at end of file
+        await invalidation_bus.publish(session, "pinned", guild_id=guild_id, message_id=pinned_message_id)
+        await session.commit()
+
+async def _apply_mapping_change(event: dict):
+    guild_id = event["guild_id"]
+    async with mapping_cache.load_lock(guild_id):
+        if event["filename"]:
+            mapping_cache.set(guild_id, event["emoji"], CachedSound(event["filename"], event["duration_ms"]))
+        else:
+            mapping_cache.discard(guild_id, event["emoji"])
+    for filename in (event["filename"], event["previous"]):
+        if filename:
+            frame_cache.discard(guild_id, filename)
+
+async def _reset_caches(event: dict):
+    mapping_cache.invalidate()
+    frame_cache.clear()
+
+invalidation_bus.subscribe("mapping", _apply_mapping_change)
+invalidation_bus.subscribe("reset", _reset_caches)
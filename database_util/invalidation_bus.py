@@ -0,0 +1,107 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database_util.db import engine
+
+INVALIDATION_CHANNEL = "reactasound_invalidation"
+BUS_PING_INTERVAL = float(os.getenv("BUS_PING_INTERVAL", "30"))
+BUS_RECONNECT_DELAY = float(os.getenv("BUS_RECONNECT_DELAY", "1"))
+BUS_RECONNECT_DELAY_MAX = float(os.getenv("BUS_RECONNECT_DELAY_MAX", "60"))
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+class InvalidationBus:
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+        self._handlers: dict[str, list[Handler]] = {}
+        self._events: asyncio.Queue[dict] | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def enabled(self) -> bool:
+        return engine.dialect.name == "postgresql"
+
+    def subscribe(self, kind: str, handler: Handler):
+        self._handlers.setdefault(kind, []).append(handler)
+
+    async def publish(self, session: AsyncSession, kind: str, **fields):
+        if not self.enabled:
+            return
+        payload = json.dumps({"origin": self.origin, "type": kind, **fields})
+        await session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": INVALIDATION_CHANNEL, "payload": payload}
+        )
+
+    async def start(self):
+        if self._tasks or not self.enabled:
+            return
+        if engine.dialect.driver != "asyncpg":
+            logging.warning(
+                f"[Bus] Listening requires the asyncpg driver, not {engine.dialect.driver}; "
+                "cache changes made by other processes will not be picked up"
+            )
+            return
+        self._events = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._listen()), asyncio.create_task(self._consume())]
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logging.warning(f"[Bus] Ignoring malformed event: {payload!r}")
+            return
+        if event.get("origin") != self.origin:
+            self._events.put_nowait(event)
+
+    async def _listen(self):
+        delay = BUS_RECONNECT_DELAY
+        connected_before = False
+        while True:
+            try:
+                async with engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    listener = raw.driver_connection
+                    lost = asyncio.Event()
+                    listener.add_termination_listener(lambda _: lost.set())
+                    await listener.add_listener(INVALIDATION_CHANNEL, self._on_notify)
+                    logging.info(f"[Bus] Listening on {INVALIDATION_CHANNEL}")
+
+                    if connected_before:
+                        self._events.put_nowait({"type": "reset"})
+                    connected_before = True
+                    delay = BUS_RECONNECT_DELAY
+
+                    while not lost.is_set():
+                        try:
+                            await asyncio.wait_for(lost.wait(), timeout=BUS_PING_INTERVAL)
+                        except asyncio.TimeoutError:
+                            await listener.execute("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"[Bus] Listener connection failed: {e}")
+
+            logging.warning(f"[Bus] Reconnecting in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BUS_RECONNECT_DELAY_MAX)
+
+    async def _consume(self):
+        while True:
+            event = await self._events.get()
+            for handler in self._handlers.get(event.get("type"), ()):
+                try:
+                    await handler(event)
+                except Exception as e:
+                    logging.error(f"[Bus] Error applying {event.get('type')} event: {e}")
+
+
+invalidation_bus = InvalidationBus()
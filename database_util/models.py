@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import BigInteger, Text, Integer, Column
+from sqlalchemy import BigInteger, Text, Integer, Float, Column, Index
 
 
 class Base(AsyncAttrs, DeclarativeBase):
@@ -9,12 +9,18 @@ class Base(AsyncAttrs, DeclarativeBase):
 
 class EmojiSoundMap(Base):
     __tablename__ = "emoji_sound_map"
+    __table_args__ = (
+        Index("ix_emoji_sound_map_guild_emoji", "guild_id", "emoji", unique=True),
+        Index("ix_emoji_sound_map_sound_filename", "sound_filename"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     guild_id: Mapped[int] = mapped_column(BigInteger)
     emoji: Mapped[str] = mapped_column(Text)
     sound_filename: Mapped[str] = mapped_column(Text)
     uploader_id: Mapped[int] = mapped_column(BigInteger)
+    duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    loudness_lufs: Mapped[float | None] = mapped_column(Float, nullable=True)
 
 
 class GuildPinnedMessage(Base):
@@ -1,11 +1,16 @@
 import discord
 import logging
-import os
 import asyncio
 import re
+from typing import Awaitable, Callable
 
 from database_util.db_util import add_or_update_mapping
 from interactions.reaction_board import ReactionBoard
+from audio.ingest import IngestError, SOUND_MAX_BYTES
+from storage.sound_store import (
+    stream_upload, store_upload, discard_upload, release_sound, lock_sounds, upload_filename, restore_missing
+)
+from monitoring.metrics import command_stage_seconds
 
 EMOJI_REGEX = re.compile(
     r'(<a?:\w+:\d+>)|([\U0001F300-\U0001FAFF\u2600-\u26FF\u2700-\u27BF])'
@@ -18,7 +23,11 @@ class AddSoundFlow:
         self.guild_id = ctx.guild.id
         self.user_id = ctx.author.id
 
-    async def start(self):
+    async def start(self, emoji_text: str | None = None, attachment: discord.Attachment | None = None):
+        if emoji_text is not None or attachment is not None:
+            await self.start_with_options(emoji_text, attachment)
+            return
+
         await self.ctx.respond(
             "📥 Please send a message with the emoji you want to bind and attach *one* sound file to that message.",
             ephemeral=True
@@ -43,29 +52,7 @@ class AddSoundFlow:
                 await message.reply("❌ Could not find a valid emoji in your message.", mention_author=False)
                 return
 
-            attachment = message.attachments[0]
-
-            guild_dir = os.path.join("sound_files", str(self.guild_id))
-            os.makedirs(guild_dir, exist_ok=True)
-            save_path = os.path.join(guild_dir, attachment.filename)
-
-            await attachment.save(save_path)
-            logging.info(f"Saved uploaded file to {save_path}")
-
-            await add_or_update_mapping(
-                guild_id=self.guild_id,
-                emoji=emoji,
-                filename=attachment.filename,
-                uploader_id=self.user_id
-            )
-
-            await message.reply(
-                f"✅ Successfully bound {emoji} to `{attachment.filename}`!",
-                mention_author=False
-            )
-
-            reaction_board = ReactionBoard(self.bot)
-            await reaction_board.update_reactions(self.ctx.guild)
+            await self.bind(emoji, message.attachments[0], lambda content: message.reply(content, mention_author=False))
 
         except asyncio.TimeoutError:
             await self.ctx.followup.send(
@@ -79,6 +66,64 @@ class AddSoundFlow:
                 ephemeral=True
             )
 
+    async def start_with_options(self, emoji_text: str | None, attachment: discord.Attachment | None):
+        emoji = self.extract_emoji(emoji_text or "")
+        if not emoji or not attachment:
+            await self.ctx.respond("❌ Please provide a valid emoji and *one* sound file.", ephemeral=True)
+            return
+
+        await self.ctx.defer(ephemeral=True)
+        try:
+            await self.bind(emoji, attachment, lambda content: self.ctx.followup.send(content, ephemeral=True))
+        except Exception as e:
+            logging.exception("Error during addsound file upload")
+            await self.ctx.followup.send(
+                "❌ There was an error processing your upload. Please try again.",
+                ephemeral=True
+            )
+
+    async def bind(self, emoji: str, attachment: discord.Attachment, reply: Callable[[str], Awaitable]):
+        if attachment.size > SOUND_MAX_BYTES:
+            await reply(
+                f"❌ `{attachment.filename}` is too large. Sounds can be at most "
+                f"{SOUND_MAX_BYTES // (1024 * 1024)} MB."
+            )
+            return
+
+        try:
+            with command_stage_seconds.time(command="addsound", stage="download"):
+                upload = await stream_upload(attachment)
+            try:
+                async with lock_sounds(upload_filename(upload)):
+                    with command_stage_seconds.time(command="addsound", stage="ingest"):
+                        filename, result = await store_upload(upload)
+                    with command_stage_seconds.time(command="addsound", stage="db"):
+                        previous = await add_or_update_mapping(
+                            guild_id=self.guild_id,
+                            emoji=emoji,
+                            filename=filename,
+                            uploader_id=self.user_id,
+                            duration_ms=result.duration_ms,
+                            loudness_lufs=result.loudness_lufs,
+                            verify=lambda: restore_missing(upload)
+                        )
+            finally:
+                await discard_upload(upload.path)
+        except IngestError as e:
+            logging.info(f"Rejected upload {attachment.filename}: {e}")
+            await reply(f"❌ {e} Please upload a different file.")
+            return
+
+        if previous and previous != filename:
+            with command_stage_seconds.time(command="addsound", stage="release"):
+                await release_sound(self.guild_id, previous)
+
+        await reply(f"✅ Successfully bound {emoji} to `{attachment.filename}`!")
+
+        reaction_board = ReactionBoard(self.bot)
+        with command_stage_seconds.time(command="addsound", stage="board"):
+            await reaction_board.update_reactions(self.ctx.guild)
+
     def extract_emoji(self, text: str) -> str | None:
         match = EMOJI_REGEX.search(text)
         if not match:
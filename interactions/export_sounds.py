@@ -0,0 +1,63 @@
+import discord
+import logging
+import os
+
+from database_util.db_util import get_all_sounds_for_guild
+from storage import async_fs
+from storage.sound_archive import build_archive
+from storage.sound_store import sound_path, discard_upload, INCOMING_DIR
+from monitoring.metrics import command_stage_seconds
+
+EXPORT_MAX_BYTES = int(os.getenv("EXPORT_MAX_BYTES", str(25 * 1024 * 1024)))
+
+
+class ExportSounds:
+    def __init__(self, bot: discord.Bot, ctx: discord.ApplicationContext):
+        self.bot = bot
+        self.ctx = ctx
+        self.guild = ctx.guild
+        self.guild_id = ctx.guild.id
+
+    async def start(self):
+        member: discord.Member = self.ctx.author
+        if not member.guild_permissions.administrator:
+            await self.ctx.respond("🚫 Only server administrators can export sounds.", ephemeral=True)
+            return
+
+        sounds = await get_all_sounds_for_guild(self.guild_id)
+        if not sounds:
+            await self.ctx.respond("⚠️ No sound mappings found in this server.", ephemeral=True)
+            return
+
+        await self.ctx.defer(ephemeral=True)
+        await async_fs.makedirs(INCOMING_DIR)
+        path = os.path.join(INCOMING_DIR, f"export-{self.guild_id}-{self.ctx.interaction.id}.zip")
+        try:
+            with command_stage_seconds.time(command="exportsounds", stage="archive"):
+                missing = await async_fs.run(
+                    build_archive, path,
+                    [(emoji, sound_path(self.guild_id, sound.filename)) for emoji, sound in sounds]
+                )
+                size = await async_fs.run(os.path.getsize, path)
+            if size > EXPORT_MAX_BYTES:
+                await self.ctx.followup.send(
+                    f"❌ The soundboard archive is {size // (1024 * 1024)} MB, more than the "
+                    f"{EXPORT_MAX_BYTES // (1024 * 1024)} MB that can be uploaded.",
+                    ephemeral=True
+                )
+                return
+
+            content = f"📦 Exported {len(sounds) - len(missing)} sound(s)."
+            if missing:
+                logging.warning(f"Sound files missing during export in {self.guild.name}: {missing}")
+                content += f"\n⚠️ Missing files for: {' '.join(missing)}"
+            with command_stage_seconds.time(command="exportsounds", stage="upload"):
+                await self.ctx.followup.send(
+                    content, file=discord.File(path, filename=f"reactasound-{self.guild_id}.zip"), ephemeral=True
+                )
+            logging.info(f"Exported {len(sounds) - len(missing)} sound(s) from {self.guild.name} ({size} bytes)")
+        except Exception as e:
+            logging.exception("Error during sound export")
+            await self.ctx.followup.send("❌ There was an error exporting the sounds. Please try again.", ephemeral=True)
+        finally:
+            await discard_upload(path)
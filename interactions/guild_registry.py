@@ -0,0 +1,70 @@
+from database_util.invalidation_bus import invalidation_bus
+
+
+class GuildState:
+    def __init__(self, channel_id: int | None = None, pinned_message_id: int | None = None,
+                 thread_id: int | None = None, channel_missing: bool = False):
+        self.channel_id = channel_id
+        self.pinned_message_id = pinned_message_id
+        self.thread_id = thread_id
+        self.channel_missing = channel_missing
+
+
+class GuildRegistry:
+    def __init__(self):
+        self._guilds: dict[int, GuildState] = {}
+
+    def get(self, guild_id: int) -> GuildState | None:
+        return self._guilds.get(guild_id)
+
+    def _state(self, guild_id: int) -> GuildState:
+        return self._guilds.setdefault(guild_id, GuildState())
+
+    def set_channel(self, guild_id: int, channel_id: int | None):
+        state = self._state(guild_id)
+        state.channel_id = channel_id
+        state.channel_missing = False
+
+    def set_channel_missing(self, guild_id: int):
+        self._guilds[guild_id] = GuildState(channel_missing=True)
+
+    def is_channel_missing(self, guild_id: int) -> bool:
+        state = self._guilds.get(guild_id)
+        return bool(state and state.channel_missing)
+
+    def set_pinned_message(self, guild_id: int, message_id: int | None):
+        self._state(guild_id).pinned_message_id = message_id
+
+    def set_thread(self, guild_id: int, thread_id: int | None):
+        self._state(guild_id).thread_id = thread_id
+
+    def is_board_message(self, guild_id: int, channel_id: int, message_id: int) -> bool | None:
+        state = self._guilds.get(guild_id)
+        if state and state.channel_missing:
+            return False
+        if not state or not state.channel_id or not state.pinned_message_id:
+            return None
+        return state.channel_id == channel_id and state.pinned_message_id == message_id
+
+    def remove(self, guild_id: int):
+        self._guilds.pop(guild_id, None)
+
+    def forget_pinned_messages(self):
+        for state in self._guilds.values():
+            state.pinned_message_id = None
+
+
+guild_registry = GuildRegistry()
+
+
+async def _apply_pinned_change(event: dict):
+    if guild_registry.get(event["guild_id"]):
+        guild_registry.set_pinned_message(event["guild_id"], event["message_id"])
+
+
+async def _forget_pinned_messages(event: dict):
+    guild_registry.forget_pinned_messages()
+
+
+invalidation_bus.subscribe("pinned", _apply_pinned_change)
+invalidation_bus.subscribe("reset", _forget_pinned_messages)
@@ -0,0 +1,172 @@
+import discord
+import logging
+import asyncio
+import os
+
+from database_util.db_util import add_or_update_mappings
+from interactions.add_sound import EMOJI_REGEX
+from interactions.reaction_board import ReactionBoard
+from audio.ingest import IngestError, IngestResult, INGEST_WORKERS
+from storage import async_fs
+from storage.sound_archive import ArchiveEntry, ArchiveError, read_manifest, extract_entry, ARCHIVE_MAX_BYTES
+from storage.sound_store import (
+    Upload, stream_upload, store_upload, discard_upload, release_sound, lock_sounds, upload_filename,
+    restore_missing
+)
+from monitoring.metrics import command_stage_seconds
+
+IMPORT_CONCURRENCY = int(os.getenv("IMPORT_CONCURRENCY", str(INGEST_WORKERS)))
+IMPORT_MAX_ERRORS_SHOWN = 10
+
+
+class ImportSounds:
+    def __init__(self, bot: discord.Bot, ctx: discord.ApplicationContext):
+        self.bot = bot
+        self.ctx = ctx
+        self.guild = ctx.guild
+        self.guild_id = ctx.guild.id
+        self.user_id = ctx.author.id
+
+    async def start(self, archive: discord.Attachment):
+        member: discord.Member = self.ctx.author
+        if not member.guild_permissions.administrator:
+            await self.ctx.respond("🚫 Only server administrators can import sounds.", ephemeral=True)
+            return
+
+        if archive.size > ARCHIVE_MAX_BYTES:
+            await self.ctx.respond(
+                f"❌ `{archive.filename}` is too large. Archives can be at most "
+                f"{ARCHIVE_MAX_BYTES // (1024 * 1024)} MB.",
+                ephemeral=True
+            )
+            return
+
+        await self.ctx.defer()
+        try:
+            await self.import_archive(archive)
+        except (ArchiveError, IngestError) as e:
+            logging.info(f"Rejected archive {archive.filename}: {e}")
+            await self.ctx.followup.send(f"❌ {e}")
+        except Exception as e:
+            logging.exception("Error during sound import")
+            await self.ctx.followup.send("❌ There was an error importing the archive. Please try again.")
+
+    async def import_archive(self, archive: discord.Attachment):
+        with command_stage_seconds.time(command="importsounds", stage="download"):
+            upload = await stream_upload(archive, max_bytes=ARCHIVE_MAX_BYTES, kind="Archives")
+        try:
+            entries = await async_fs.run(read_manifest, upload.path)
+            errors = []
+            valid = []
+            for entry in entries:
+                problem = self.check_emoji(entry.emoji)
+                if problem:
+                    errors.append(f"{entry.emoji}: {problem}")
+                else:
+                    valid.append(entry)
+            entries = valid
+
+            semaphore = asyncio.Semaphore(IMPORT_CONCURRENCY)
+            with command_stage_seconds.time(command="importsounds", stage="extract"):
+                extracted = await asyncio.gather(
+                    *(self.extract(upload.path, index, entry, semaphore) for index, entry in enumerate(entries))
+                )
+        finally:
+            await discard_upload(upload.path)
+
+        uploads = []
+        for entry, result in zip(entries, extracted):
+            if isinstance(result, Exception):
+                errors.append(f"{entry.emoji}: {result}")
+            else:
+                uploads.append((entry, result))
+
+        unique = {}
+        for entry, entry_upload in uploads:
+            unique.setdefault(upload_filename(entry_upload), (entry, entry_upload))
+
+        sounds = []
+        stored_filenames = []
+        committed = False
+        try:
+            async with lock_sounds(*unique):
+                with command_stage_seconds.time(command="importsounds", stage="ingest"):
+                    stored = await asyncio.gather(
+                        *(self.store(entry, entry_upload, semaphore) for entry, entry_upload in unique.values())
+                    )
+                results = dict(zip(unique, stored))
+                stored_filenames = [result[0] for result in stored if not isinstance(result, Exception)]
+                for entry, entry_upload in uploads:
+                    result = results[upload_filename(entry_upload)]
+                    if isinstance(result, Exception):
+                        errors.append(f"{entry.emoji}: {result}")
+                    else:
+                        filename, ingested = result
+                        sounds.append((entry.emoji, filename, ingested.duration_ms, ingested.loudness_lufs))
+
+                if sounds:
+                    with command_stage_seconds.time(command="importsounds", stage="db"):
+                        previous = await add_or_update_mappings(
+                            self.guild_id, self.user_id, sounds,
+                            verify=lambda: restore_missing(*(unique[name][1] for name in stored_filenames))
+                        )
+                committed = True
+        finally:
+            for _, entry_upload in uploads:
+                await discard_upload(entry_upload.path)
+            if not committed:
+                for filename in stored_filenames:
+                    await release_sound(self.guild_id, filename)
+
+        if sounds:
+            with command_stage_seconds.time(command="importsounds", stage="release"):
+                for (_, filename, _, _), previous_filename in zip(sounds, previous):
+                    if previous_filename and previous_filename != filename:
+                        await release_sound(self.guild_id, previous_filename)
+
+        logging.info(f"Imported {len(sounds)} sound(s) into {self.guild.name}, {len(errors)} rejected")
+        summary = f"✅ Imported {len(sounds)} sound(s) from `{archive.filename}`."
+        if errors:
+            shown = "\n".join(f"• {error}" for error in errors[:IMPORT_MAX_ERRORS_SHOWN])
+            more = len(errors) - IMPORT_MAX_ERRORS_SHOWN
+            summary += f"\n\n⚠️ Skipped {len(errors)} sound(s):\n{shown}"
+            if more > 0:
+                summary += f"\n…and {more} more."
+        await self.ctx.followup.send(summary)
+
+        if sounds:
+            reaction_board = ReactionBoard(self.bot)
+            with command_stage_seconds.time(command="importsounds", stage="board"):
+                await reaction_board.update_reactions(self.guild)
+
+    async def extract(self, archive_path: str, index: int, entry: ArchiveEntry,
+                      semaphore: asyncio.Semaphore) -> Upload | Exception:
+        async with semaphore:
+            try:
+                return await async_fs.run(extract_entry, archive_path, entry, f"{os.path.basename(archive_path)}.{index}")
+            except ArchiveError as e:
+                logging.info(f"Rejected {entry.member} from archive: {e}")
+                return e
+            except Exception:
+                logging.exception(f"Failed to extract {entry.member} from archive")
+                return ArchiveError("The file could not be unpacked.")
+
+    async def store(self, entry: ArchiveEntry, upload: Upload,
+                    semaphore: asyncio.Semaphore) -> tuple[str, IngestResult] | Exception:
+        async with semaphore:
+            try:
+                return await store_upload(upload)
+            except IngestError as e:
+                logging.info(f"Rejected {entry.member} from archive: {e}")
+                return e
+            except Exception:
+                logging.exception(f"Failed to store {entry.member} from archive")
+                return IngestError("The file could not be processed.")
+
+    def check_emoji(self, emoji: str) -> str | None:
+        match = EMOJI_REGEX.fullmatch(emoji)
+        if not match:
+            return "not a valid emoji"
+        if match.group(1) and int(emoji[:-1].rsplit(":", 1)[1]) not in {e.id for e in self.guild.emojis}:
+            return "custom emoji is not available in this server"
+        return None
@@ -1,172 +1,304 @@
 import discord
 import logging
 import os
+import time
 import asyncio
-from discord import RawReactionActionEvent, ConnectionClosed
-from database_util.db_util import get_sound_filename
+from discord import RawReactionActionEvent
+from database_util.db_util import get_sound
+from database_util.cache import CachedSound
 from interactions.reaction_board import ReactionBoard
+from interactions.guild_registry import guild_registry
+from interactions.voice_sessions import voice_sessions, VoiceCircuitOpen
+from interactions.voice_prewarm import voice_prewarmer
+from interactions.playback_scheduler import playback_scheduler, PlaybackJob
+from interactions.reaction_cleanup import reaction_cleanup
+from audio.opus import open_sound_source, is_content_addressed, PrimedSource
+from audio.frame_cache import frame_cache, OpusFrameSource
+from audio.mixer import MixerClip, get_mixer, opus_pcm_reader
+from storage.sound_store import sound_path
+from storage import async_fs
+from logs.log_config import REACTION_LOGGER
+from logs.reaction_trace import ReactionTrace
 
-guild_locks = {}
+log = logging.getLogger(REACTION_LOGGER)
 
-async def _wait_until_done(vc: discord.VoiceClient):
-    logging.info("[Wait] Waiting for audio to finish playing...")
-    while vc.is_playing():
-        await asyncio.sleep(0.5)
-    logging.info("[Wait] Audio finished.")
+PLAYBACK_TIMEOUT = float(os.getenv("PLAYBACK_TIMEOUT", "30"))
+PLAYBACK_TIMEOUT_MARGIN = float(os.getenv("PLAYBACK_TIMEOUT_MARGIN", "2"))
 
-async def connect_with_retries(voice_channel: discord.VoiceChannel, max_retries=5, delay=10):
-    for attempt in range(1, max_retries + 1):
-        logging.info(f"[Connect] Attempt {attempt} to connect to {voice_channel.name} ({voice_channel.guild.id})")
-        try:
-            vc = await voice_channel.connect()
-            logging.info("[Connect] Voice handshake complete.")
-            return vc
-        except ConnectionClosed as cc:
-            logging.error(f"[Connect] Voice websocket closed (code {cc.code})")
-            if cc.code == 4006:
-                logging.warning("[Connect] Session invalidated. Forcing fresh reconnect.")
-                try:
-                    if voice_channel.guild.voice_client:
-                        await voice_channel.guild.voice_client.disconnect()
-                        await asyncio.sleep(5)
-                except Exception as e:
-                    logging.error(f"[Connect] Error during forced disconnect: {e}")
-                await asyncio.sleep(10)
-            else:
-                await asyncio.sleep(delay)
-        except Exception as e:
-            logging.error(f"[Connect] Exception connecting to voice: {e}")
-            await asyncio.sleep(delay)
-    logging.error("[Connect] Failed to connect after retries")
-    return None
+def _playback_timeout(sound: CachedSound) -> float:
+    if sound.duration_ms:
+        return sound.duration_ms / 1000 + PLAYBACK_TIMEOUT_MARGIN
+    return PLAYBACK_TIMEOUT
 
-async def handle_reaction(bot: discord.Bot, payload: RawReactionActionEvent):
-    logging.info(f"[Reaction] Handling reaction from user {payload.user_id} in guild {payload.guild_id}")
+class _FirstPacketTimer(discord.AudioSource):
+    def __init__(self, source: discord.AudioSource, trace: ReactionTrace, loop: asyncio.AbstractEventLoop):
+        self.source = source
+        self._trace = trace
+        self._loop = loop
+        self._started = time.monotonic()
+        self._timed = False
+
+    def read(self) -> bytes:
+        data = self.source.read()
+        if not self._timed:
+            self._timed = True
+            self._loop.call_soon_threadsafe(self._trace.record, "first_packet", time.monotonic() - self._started)
+        return data
+
+    def is_opus(self) -> bool:
+        return self.source.is_opus()
+
+    def cleanup(self):
+        self.source.cleanup()
+
+async def _play_until_done(vc: discord.VoiceClient, audio: discord.AudioSource, trace: ReactionTrace):
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+    audio = _FirstPacketTimer(audio, trace, loop)
 
+    def after(error: Exception | None):
+        if error:
+            log.error(f"[Play] Player error: {error}")
+        loop.call_soon_threadsafe(_resolve, done)
+
+    try:
+        vc.play(audio, after=after)
+    except Exception:
+        audio.cleanup()
+        raise
+    log.info("[Play] Playing audio.")
+    try:
+        await done
+    finally:
+        if not done.done() and vc.is_playing():
+            vc.stop()
+    log.info("[Wait] Audio finished.")
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+async def handle_reaction(bot: discord.Bot, payload: RawReactionActionEvent):
     if payload.guild_id is None:
-        logging.warning("[Reaction] Missing guild_id.")
+        log.warning("[Reaction] Missing guild_id.")
         return
-    guild = bot.get_guild(payload.guild_id)
-    if not guild:
-        logging.warning(f"[Reaction] Guild with ID {payload.guild_id} not found.")
+    if bot.user and payload.user_id == bot.user.id:
         return
 
-    reaction_board = ReactionBoard(bot)
-    try:
-        pinned = await reaction_board.get_or_create_pinned_message(guild)
-        logging.info(f"[Reaction] Found or created pinned message: {pinned.id}")
-    except Exception as e:
-        logging.warning(f"[Init] Error initializing pinned message: {e}")
+    is_board = guild_registry.is_board_message(payload.guild_id, payload.channel_id, payload.message_id)
+    if is_board is False:
         return
 
-    if payload.message_id != pinned.id:
-        logging.info(f"[Reaction] Ignoring reaction, message ID doesn't match pinned.")
+    log.info(f"[Reaction] Handling reaction from user {payload.user_id} in guild {payload.guild_id}")
+
+    guild = bot.get_guild(payload.guild_id)
+    if not guild:
+        log.warning(f"[Reaction] Guild with ID {payload.guild_id} not found.")
         return
 
+    trace = ReactionTrace(guild.id, payload.user_id, str(payload.emoji))
+    if is_board is None:
+        reaction_board = ReactionBoard(bot)
+        try:
+            with trace.stage("resolve"):
+                state = await reaction_board.resolve_board(guild)
+            log.info(f"[Reaction] Resolved pinned message: {state.pinned_message_id}")
+        except Exception as e:
+            log.warning(f"[Init] Error initializing pinned message: {e}")
+            return
+
+        if payload.message_id != state.pinned_message_id or payload.channel_id != state.channel_id:
+            log.info(f"[Reaction] Ignoring reaction, message ID doesn't match pinned.")
+            return
+
+    outcome = await _handle_board_reaction(guild, payload, trace)
+    if outcome:
+        trace.finish(outcome)
+
+async def _handle_board_reaction(guild: discord.Guild, payload: RawReactionActionEvent,
+                                 trace: ReactionTrace) -> str | None:
+
     channel = guild.get_channel(payload.channel_id)
-    if not channel or channel.name != "reactasound":
-        logging.info(f"[Reaction] Ignoring reaction, incorrect channel: {channel.name if channel else 'Unknown'}")
-        return
+    if not channel:
+        log.info(f"[Reaction] Ignoring reaction, unknown channel: {payload.channel_id}")
+        return "ignored"
 
-    member = guild.get_member(payload.user_id)
+    member = payload.member or guild.get_member(payload.user_id)
     if not member or member.bot:
-        logging.info(f"[Reaction] Ignoring reaction from bot or missing member.")
-        return
+        log.info(f"[Reaction] Ignoring reaction from bot or missing member.")
+        return "ignored"
 
     emoji = str(payload.emoji)
-    logging.info(f"[Reaction] Received '{emoji}' from {member.display_name} in {guild.name}")
+    log.info(f"[Reaction] Received '{emoji}' from {member.display_name} in {guild.name}")
+    voice_prewarmer.note_activity(guild.id)
 
-    soundfile = await get_sound_filename(guild.id, emoji)
-    if not soundfile:
-        logging.info("[Reaction] No sound mapped for emoji.")
-        return
+    with trace.stage("lookup"):
+        sound = await get_sound(guild.id, emoji)
+    if not sound:
+        log.info("[Reaction] No sound mapped for emoji.")
+        return "no_sound"
 
     if not member.voice or not member.voice.channel:
         await channel.send(f"{member.mention} you’re not in voice!")
-        logging.info(f"[Reaction] {member.display_name} is not in a voice channel.")
-        return
+        log.info(f"[Reaction] {member.display_name} is not in a voice channel.")
+        return "not_in_voice"
     voice_channel = member.voice.channel
 
-    filepath = f"sound_files/{guild.id}/{soundfile}"
-    if not os.path.isfile(filepath):
+    soundfile = sound.filename
+    filepath = sound_path(guild.id, soundfile)
+    frames = None
+    try:
+        with trace.stage("load"):
+            if is_content_addressed(soundfile):
+                frames = await frame_cache.load(guild.id, soundfile, filepath)
+                missing = frames is None and not await async_fs.isfile(filepath)
+            else:
+                missing = not await async_fs.isfile(filepath)
+    except Exception as e:
+        log.error(f"[Reaction] Could not load {soundfile}: {e}")
+        await channel.send("❌ Playback failed.")
+        return "play_failed"
+    if missing:
         await channel.send(f"⚠️ Missing file: {soundfile}")
-        logging.warning(f"[Reaction] Missing file: {soundfile}")
-        return
+        log.warning(f"[Reaction] Missing file: {soundfile}")
+        return "missing_file"
 
-    lock = guild_locks.setdefault(guild.id, asyncio.Lock())
-
-    async with lock:
-        vc = guild.voice_client
-        connected_here = False
-
-        if vc:
-            if not vc.is_connected():
-                logging.info("[Cleanup] Disconnecting stale client")
-                try:
-                    await vc.disconnect()
-                    await asyncio.sleep(2)
-                except Exception as e:
-                    logging.error(f"[Cleanup] Error disconnecting stale client: {e}")
-                vc = None
-            elif vc.channel.id != voice_channel.id:
-                logging.info("[Cleanup] Disconnecting client from wrong channel")
-                try:
-                    await vc.disconnect()
-                    await asyncio.sleep(2)
-                except Exception as e:
-                    logging.error(f"[Cleanup] Error disconnecting wrong-channel client: {e}")
-                vc = None
-
-        if not vc:
-            logging.info(f"[Connect] Connecting to voice channel {voice_channel.name}")
-            vc = await connect_with_retries(voice_channel)
-            if not vc or not vc.is_connected():
-                await channel.send("❌ Could not connect to voice.")
-                logging.error("[Connect] Could not connect to voice.")
-                return
-            connected_here = True
-
-        await asyncio.sleep(1)
-
-        logging.info(f"[Play] Attempting to play audio from {filepath}")
-        try:
-            if vc.is_playing():
-                logging.info("[Play] Stopping currently playing audio.")
-                vc.stop()
-                await asyncio.sleep(0.2)
-            audio = discord.FFmpegOpusAudio(source=filepath, options="-vn")
-            vc.play(audio)
-            logging.info("[Play] Playing audio.")
-        except Exception as e:
-            logging.error(f"[Play] Error: {e}")
-            await channel.send("❌ Playback failed.")
-            if connected_here:
-                try:
-                    await vc.disconnect()
-                    await asyncio.sleep(1)
-                except Exception:
-                    pass
-            return
+    queued_at = time.monotonic()
 
+    async def play():
+        trace.record("queue_wait", time.monotonic() - queued_at)
+        outcome = "play_failed"
         try:
-            await asyncio.wait_for(_wait_until_done(vc), timeout=30)
-        except asyncio.TimeoutError:
-            logging.warning("[Play] Timeout, stopping audio.")
+            outcome = await _play_sound(guild, channel, voice_channel, filepath, frames,
+                                        _playback_timeout(sound), trace)
+        finally:
+            reaction_cleanup.schedule(channel, payload.message_id, payload.emoji, member.id)
+            trace.finish(outcome)
+
+    def drop():
+        reaction_cleanup.schedule(channel, payload.message_id, payload.emoji, member.id)
+        trace.finish("dropped")
+
+    job = PlaybackJob(key=emoji, run=play, drop=drop)
+    if not playback_scheduler.submit(guild, job):
+        reaction_cleanup.schedule(channel, payload.message_id, payload.emoji, member.id)
+        return "dropped"
+    log.info(f"[Reaction] Queued '{emoji}' ({playback_scheduler.queue_depth(guild.id)} in queue)")
+    return None
+
+def _open_source(filepath: str, mixing: bool) -> discord.AudioSource:
+    if mixing:
+        source = discord.FFmpegPCMAudio(filepath, options="-vn")
+    else:
+        source = open_sound_source(filepath)
+    return PrimedSource(source)
+
+def _discard_prepared(prepare: asyncio.Task | None):
+    if prepare is None:
+        return
+
+    def cleanup(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is None:
+            task.result().cleanup()
+
+    prepare.add_done_callback(cleanup)
+
+async def _await_prepared(prepare: asyncio.Task) -> discord.AudioSource:
+    try:
+        return await asyncio.shield(prepare)
+    except asyncio.CancelledError:
+        _discard_prepared(prepare)
+        raise
+
+async def _play_sound(guild: discord.Guild, channel: discord.TextChannel, voice_channel: discord.VoiceChannel,
+                      filepath: str, frames: tuple[bytes, ...] | None, timeout: float,
+                      trace: ReactionTrace) -> str:
+    mixing = playback_scheduler.policy == "mix"
+    prepare = None
+    if frames is None:
+        prepare = asyncio.create_task(async_fs.run(_open_source, filepath, mixing))
+
+    try:
+        with trace.stage("connect"):
+            vc = await voice_sessions.acquire(voice_channel)
+    except VoiceCircuitOpen as e:
+        _discard_prepared(prepare)
+        await channel.send(
+            f"🔌 Voice connections are failing right now, so I'm holding off. "
+            f"Try again in {max(1, round(e.retry_after))}s."
+        )
+        return "voice_unavailable"
+    except BaseException:
+        _discard_prepared(prepare)
+        raise
+    if not vc:
+        _discard_prepared(prepare)
+        await channel.send("❌ Could not connect to voice.")
+        log.error("[Connect] Could not connect to voice.")
+        return "connect_failed"
+
+    if mixing:
+        with trace.stage("play"):
+            outcome = await _mix_sound(vc, channel, filepath, frames, prepare, timeout)
+        voice_sessions.touch(guild)
+        return outcome
+
+    log.info(f"[Play] Attempting to play audio from {filepath}")
+    try:
+        if frames is not None:
+            audio = OpusFrameSource(frames)
+        else:
+            with trace.stage("source"):
+                audio = await _await_prepared(prepare)
+        if vc.is_playing():
+            log.info("[Play] Stopping currently playing audio.")
             vc.stop()
+        playback = _play_until_done(vc, audio, trace)
+    except Exception as e:
+        log.error(f"[Play] Error: {e}")
+        await channel.send("❌ Playback failed.")
+        return "play_failed"
 
-        await asyncio.sleep(1)
+    outcome = "played"
+    try:
+        with trace.stage("play"):
+            await asyncio.wait_for(playback, timeout=timeout)
+    except asyncio.TimeoutError:
+        log.warning("[Play] Timeout, stopping audio.")
+        outcome = "timeout"
+    except Exception as e:
+        log.error(f"[Play] Error: {e}")
+        await channel.send("❌ Playback failed.")
+        outcome = "play_failed"
 
-        try:
-            msg = await channel.fetch_message(payload.message_id)
-            await msg.remove_reaction(payload.emoji, member)
-            logging.info("[React] Removed user reaction.")
-        except Exception as e:
-            logging.warning(f"[React] Failed to remove reaction: {e}")
-
-        if connected_here and vc.is_connected() and not vc.is_playing():
-            try:
-                logging.info(f"[Disconnect] Disconnecting from {voice_channel.name}")
-                await vc.disconnect()
-                await asyncio.sleep(1)
-            except Exception as e:
-                logging.warning(f"[Disconnect] Error during disconnect: {e}")
+    voice_sessions.touch(guild)
+    return outcome
+
+async def _mix_sound(vc: discord.VoiceClient, channel: discord.TextChannel, filepath: str,
+                     frames: tuple[bytes, ...] | None, prepare: asyncio.Task | None, timeout: float) -> str:
+    log.info(f"[Mix] Adding {filepath} to the mix")
+    pcm = None
+    clip = None
+    try:
+        if frames is not None:
+            clip = MixerClip(opus_pcm_reader(frames))
+        else:
+            pcm = await _await_prepared(prepare)
+            clip = MixerClip(pcm.read, cleanup=pcm.cleanup)
+        get_mixer(vc).add(clip)
+    except Exception as e:
+        if clip:
+            clip.finish()
+        elif pcm:
+            pcm.cleanup()
+        log.error(f"[Mix] Error: {e}")
+        await channel.send("❌ Playback failed.")
+        return "play_failed"
+
+    try:
+        await asyncio.wait_for(asyncio.shield(clip.done), timeout=timeout)
+    except asyncio.TimeoutError:
+        log.warning("[Mix] Timeout, dropping clip.")
+        clip.stop()
+        return "timeout"
+    return "played"
@@ -0,0 +1,128 @@
+import discord
+import logging
+import os
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable
+from logs.log_config import REACTION_LOGGER
+
+log = logging.getLogger(REACTION_LOGGER)
+
+PLAYBACK_POLICIES = ("queue", "interrupt", "coalesce", "mix")
+PLAYBACK_POLICY = os.getenv("PLAYBACK_POLICY", "queue")
+PLAYBACK_QUEUE_SIZE = int(os.getenv("PLAYBACK_QUEUE_SIZE", "5"))
+
+
+class PlaybackJob:
+    def __init__(self, key: str, run: Callable[[], Awaitable[None]], drop: Callable[[], None] | None = None):
+        self.key = key
+        self.run = run
+        self.drop = drop
+
+    def discard(self):
+        if not self.drop:
+            return
+        try:
+            self.drop()
+        except Exception:
+            log.exception(f"[Scheduler] Error dropping playback job {self.key}")
+
+
+class GuildPlaybackQueue:
+    def __init__(self, guild: discord.Guild):
+        self.guild = guild
+        self.pending: deque[PlaybackJob] = deque()
+        self.current: asyncio.Task | None = None
+        self.worker: asyncio.Task | None = None
+        self.mixing: set[asyncio.Task] = set()
+
+    def depth(self) -> int:
+        running = 1 if self.current and not self.current.done() else 0
+        return len(self.pending) + running + len(self.mixing)
+
+
+class PlaybackScheduler:
+    def __init__(self, policy: str = PLAYBACK_POLICY, max_pending: int = PLAYBACK_QUEUE_SIZE):
+        if policy not in PLAYBACK_POLICIES:
+            raise ValueError(f"Unknown playback policy: {policy}")
+        self.policy = policy
+        self.max_pending = max_pending
+        self._queues: dict[int, GuildPlaybackQueue] = {}
+
+    def submit(self, guild: discord.Guild, job: PlaybackJob) -> bool:
+        queue = self._queues.get(guild.id)
+        if not queue:
+            queue = self._queues[guild.id] = GuildPlaybackQueue(guild)
+
+        if self.policy == "mix":
+            if len(queue.mixing) >= self.max_pending:
+                log.info(f"[Scheduler] Mixer full in {guild.name}, dropping {job.key}")
+                return False
+            task = asyncio.create_task(job.run())
+            queue.mixing.add(task)
+            task.add_done_callback(lambda t: self._mix_done(queue, job, t))
+            return True
+
+        if self.policy == "interrupt":
+            evicted = list(queue.pending)
+            queue.pending.clear()
+            for pending in evicted:
+                log.info(f"[Scheduler] Dropping queued {pending.key} in {guild.name}")
+                pending.discard()
+            vc = guild.voice_client
+            if vc and vc.is_playing():
+                log.info(f"[Scheduler] Interrupting current clip in {guild.name}")
+                vc.stop()
+        elif self.policy == "coalesce":
+            if any(pending.key == job.key for pending in queue.pending):
+                log.info(f"[Scheduler] Dropping duplicate {job.key} in {guild.name}")
+                return False
+
+        if len(queue.pending) >= self.max_pending:
+            log.info(f"[Scheduler] Queue full in {guild.name}, dropping {job.key}")
+            return False
+
+        queue.pending.append(job)
+        if not queue.worker or queue.worker.done():
+            queue.worker = asyncio.create_task(self._run(queue))
+        return True
+
+    async def _run(self, queue: GuildPlaybackQueue):
+        while queue.pending:
+            job = queue.pending.popleft()
+            queue.current = asyncio.create_task(job.run())
+            await asyncio.wait([queue.current])
+            if not queue.current.cancelled() and queue.current.exception():
+                log.error(
+                    f"[Scheduler] Playback job {job.key} failed in {queue.guild.name}",
+                    exc_info=queue.current.exception()
+                )
+        queue.current = None
+        self._release(queue)
+
+    def _mix_done(self, queue: GuildPlaybackQueue, job: PlaybackJob, task: asyncio.Task):
+        queue.mixing.discard(task)
+        if not task.cancelled() and task.exception():
+            log.error(
+                f"[Scheduler] Playback job {job.key} failed in {queue.guild.name}",
+                exc_info=task.exception()
+            )
+        self._release(queue)
+
+    def _release(self, queue: GuildPlaybackQueue):
+        if queue.depth() == 0 and self._queues.get(queue.guild.id) is queue:
+            self._queues.pop(queue.guild.id)
+
+    def queue_depth(self, guild_id: int) -> int:
+        queue = self._queues.get(guild_id)
+        return queue.depth() if queue else 0
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "guilds": len(self._queues),
+            "queued": sum(queue.depth() for queue in self._queues.values()),
+        }
+
+
+playback_scheduler = PlaybackScheduler()
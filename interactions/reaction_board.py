@@ -1,32 +1,75 @@
 import logging
+import asyncio
+import io
 import discord
 from database_util.db_util import get_all_emojis_for_guild, get_pinned_message_id, upsert_pinned_message_id
+from interactions.guild_registry import guild_registry, GuildState
+from storage import async_fs
+
+_board_updates: dict[int, asyncio.Task] = {}
+_board_dirty: set[int] = set()
 
 
 class ReactionBoard:
     def __init__(self, bot: discord.Bot):
         self.bot = bot
 
-    async def get_or_create_pinned_message(self, guild: discord.Guild) -> discord.Message:
-        channel = discord.utils.get(guild.text_channels, name="reactasound")
+    def get_board_channel(self, guild: discord.Guild) -> discord.TextChannel:
+        state = guild_registry.get(guild.id)
+        channel = guild.get_channel(state.channel_id) if state and state.channel_id else None
+        if not channel:
+            channel = discord.utils.get(guild.text_channels, name="reactasound")
         if not channel:
+            guild_registry.set_channel_missing(guild.id)
             raise ValueError(f"reactasound channel not found in guild: {guild.name}")
 
-        pinned_msg_id = await get_pinned_message_id(guild.id)
+        guild_registry.set_channel(guild.id, channel.id)
+        return channel
+
+    async def resolve_board(self, guild: discord.Guild) -> GuildState:
+        channel = self.get_board_channel(guild)
+
+        state = guild_registry.get(guild.id)
+        if not state.pinned_message_id:
+            pinned_msg_id = await get_pinned_message_id(guild.id)
+            if pinned_msg_id:
+                guild_registry.set_pinned_message(guild.id, pinned_msg_id)
+            else:
+                await self.get_or_create_pinned_message(guild)
+
+        if not state.thread_id:
+            thread = next(
+                (t for t in guild.threads if t.parent_id == channel.id and t.name == "botcommands"),
+                None
+            )
+            if thread:
+                guild_registry.set_thread(guild.id, thread.id)
+
+        return state
+
+    async def get_or_create_pinned_message(self, guild: discord.Guild) -> discord.Message:
+        channel = self.get_board_channel(guild)
+
+        state = guild_registry.get(guild.id)
+        pinned_msg_id = state.pinned_message_id or await get_pinned_message_id(guild.id)
         if pinned_msg_id:
             try:
                 msg = await channel.fetch_message(pinned_msg_id)
+                guild_registry.set_pinned_message(guild.id, msg.id)
                 return msg
             except discord.NotFound:
                 logging.warning(f"Pinned message ID {pinned_msg_id} from DB not found. Recreating.")
+                guild_registry.set_pinned_message(guild.id, None)
 
         pins = await channel.pins()
         for pin in pins:
             if pin.author == self.bot.user:
                 await upsert_pinned_message_id(guild.id, pin.id)
+                guild_registry.set_pinned_message(guild.id, pin.id)
                 return pin
 
-        file = discord.File("assets/reaction_board.jpg", filename="reaction_board.jpg")
+        image = await async_fs.read_cached("assets/reaction_board.jpg")
+        file = discord.File(io.BytesIO(image), filename="reaction_board.jpg")
 
         embed = discord.Embed(
             title="🎵 ReactASound Soundboard",
@@ -40,26 +83,61 @@ class ReactionBoard:
         message = await channel.send(embed=embed, file=file)
         await message.pin()
         await upsert_pinned_message_id(guild.id, message.id)
+        guild_registry.set_pinned_message(guild.id, message.id)
         logging.info(f"Created and pinned new soundboard message in {guild.name}")
         return message
 
     async def update_reactions(self, guild: discord.Guild):
-        message = await self.get_or_create_pinned_message(guild)
+        task = _board_updates.get(guild.id)
+        if task and not task.done():
+            _board_dirty.add(guild.id)
+        else:
+            task = _board_updates[guild.id] = asyncio.create_task(self._reconcile_until_clean(guild))
+            task.add_done_callback(lambda t: _forget_update(guild.id, t))
+        await asyncio.shield(task)
 
-        try:
-            await message.clear_reactions()
-        except discord.Forbidden:
-            logging.warning(f"Missing permissions to clear reactions in guild {guild.name}")
-        except Exception as e:
-            logging.warning(f"Could not clear reactions in {guild.name}: {e}")
+    async def _reconcile_until_clean(self, guild: discord.Guild):
+        while True:
+            _board_dirty.discard(guild.id)
+            await self._reconcile(guild)
+            if guild.id not in _board_dirty:
+                return
 
+    async def _reconcile(self, guild: discord.Guild):
+        message = await self.get_or_create_pinned_message(guild)
         emoji_list = await get_all_emojis_for_guild(guild.id)
+        wanted = set(emoji_list)
+        present = {str(reaction.emoji) for reaction in message.reactions if reaction.me}
+
+        for reaction in message.reactions:
+            emoji = str(reaction.emoji)
+            if emoji in wanted:
+                continue
+            try:
+                await message.clear_reaction(reaction.emoji)
+            except discord.Forbidden:
+                logging.warning(f"Missing permissions to clear reaction {emoji} in guild {guild.name}")
+                if reaction.me:
+                    try:
+                        await message.remove_reaction(reaction.emoji, self.bot.user)
+                    except discord.HTTPException as e:
+                        logging.warning(f"Could not remove own reaction {emoji} in {guild.name}: {e}")
+            except Exception as e:
+                logging.warning(f"Could not clear reaction {emoji} in {guild.name}: {e}")
+
         if not emoji_list:
             logging.info(f"No emoji mappings found for guild {guild.name}")
             return
 
         for emoji in emoji_list:
+            if emoji in present:
+                continue
             try:
                 await message.add_reaction(emoji)
             except discord.HTTPException as e:
                 logging.warning(f"Failed to add reaction: {emoji} in {guild.name} — {e}")
+
+
+def _forget_update(guild_id: int, task: asyncio.Task):
+    if _board_updates.get(guild_id) is task:
+        del _board_updates[guild_id]
@@ -0,0 +1,55 @@
+import discord
+import logging
+import os
+import time
+import asyncio
+from logs.log_config import REACTION_LOGGER
+from monitoring.metrics import reaction_removal_seconds
+
+log = logging.getLogger(REACTION_LOGGER)
+
+REACTION_REMOVE_INTERVAL = float(os.getenv("REACTION_REMOVE_INTERVAL", "0.25"))
+
+
+class ReactionCleanup:
+    def __init__(self, interval: float = REACTION_REMOVE_INTERVAL):
+        self.interval = interval
+        self._pending: dict[int, dict[tuple[str, int], discord.PartialEmoji]] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+
+    def schedule(self, channel: discord.TextChannel, message_id: int, emoji: discord.PartialEmoji, user_id: int):
+        batch = self._pending.setdefault(message_id, {})
+        batch[(str(emoji), user_id)] = emoji
+
+        worker = self._workers.get(message_id)
+        if not worker or worker.done():
+            self._workers[message_id] = asyncio.create_task(self._drain(channel, message_id))
+
+    def pending(self) -> int:
+        return sum(len(batch) for batch in self._pending.values())
+
+    async def _drain(self, channel: discord.TextChannel, message_id: int):
+        message = channel.get_partial_message(message_id)
+        try:
+            while self._pending.get(message_id):
+                batch = self._pending.pop(message_id)
+                for (emoji_name, user_id), emoji in batch.items():
+                    started = time.monotonic()
+                    result = "removed"
+                    try:
+                        await message.remove_reaction(emoji, discord.Object(id=user_id))
+                    except discord.NotFound:
+                        result = "not_found"
+                    except discord.HTTPException as e:
+                        log.warning(f"[React] Failed to remove reaction {emoji_name} for {user_id}: {e}")
+                        result = "failed"
+                    except Exception as e:
+                        log.error(f"[React] Unexpected error removing reaction {emoji_name}: {e}")
+                        result = "failed"
+                    reaction_removal_seconds.observe(time.monotonic() - started, result=result)
+                    await asyncio.sleep(self.interval)
+        finally:
+            self._workers.pop(message_id, None)
+
+
+reaction_cleanup = ReactionCleanup()
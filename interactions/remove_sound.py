@@ -1,13 +1,12 @@
 import discord
 import logging
 import asyncio
-import os
+from typing import Awaitable, Callable
 
-from database_util.db_util import get_all_emojis_for_guild
-from database_util.models import EmojiSoundMap
-from sqlalchemy import select, delete
-from database_util.db import Session
+from database_util.db_util import get_all_emojis_for_guild, delete_mapping
 from interactions.reaction_board import ReactionBoard
+from storage.sound_store import release_sound
+from monitoring.metrics import command_stage_seconds
 
 
 class DeleteSound:
@@ -18,12 +17,16 @@ class DeleteSound:
         self.guild_id = ctx.guild.id
         self.user_id = ctx.author.id
 
-    async def start(self):
+    async def start(self, emoji: str | None = None):
         member: discord.Member = self.ctx.author
         if not member.guild_permissions.administrator:
             await self.ctx.respond("🚫 Only server administrators can delete sound mappings.", ephemeral=True)
             return
 
+        if emoji is not None:
+            await self.delete_with_option(emoji)
+            return
+
         emojis = await get_all_emojis_for_guild(self.guild_id)
         if not emojis:
             await self.ctx.respond("⚠️ No sound mappings found in this server.", ephemeral=True)
@@ -49,43 +52,42 @@ class DeleteSound:
             selected_idx = int(message.content) - 1
             emoji_to_delete = emojis[selected_idx]
 
-            async with Session() as session:
-                result = await session.scalar(
-                    select(EmojiSoundMap.sound_filename).where(
-                        EmojiSoundMap.guild_id == self.guild_id,
-                        EmojiSoundMap.emoji == emoji_to_delete
-                    )
-                )
-
-                if result:
-                    filename = result
-                    await session.execute(
-                        delete(EmojiSoundMap).where(
-                            EmojiSoundMap.guild_id == self.guild_id,
-                            EmojiSoundMap.emoji == emoji_to_delete
-                        )
-                    )
-                    await session.commit()
-
-                    file_path = os.path.join("sound_files", str(self.guild_id), filename)
-                    try:
-                        os.remove(file_path)
-                        logging.info(f"Deleted sound file: {file_path}")
-                    except FileNotFoundError:
-                        logging.warning(f"File not found when trying to delete: {file_path}")
-                    except Exception as e:
-                        logging.error(f"Failed to delete file: {file_path} — {e}")
-                else:
-                    await message.reply("❌ Could not find a sound mapping to delete.", mention_author=False)
-                    return
-
-            await message.reply(f"✅ Deleted mapping and removed `{filename}` for {emoji_to_delete}.", mention_author=False)
-
-            reaction_board = ReactionBoard(self.bot)
-            await reaction_board.update_reactions(self.guild)
+            await self.delete(emoji_to_delete, lambda content: message.reply(content, mention_author=False))
 
         except asyncio.TimeoutError:
             await self.ctx.followup.send("⌛ Timeout! No input received. Please try again.", ephemeral=True)
         except Exception as e:
             logging.exception("Error during deletion of sound mapping")
             await self.ctx.followup.send("❌ There was an error processing your deletion. Please try again.", ephemeral=True)
+
+    async def delete_with_option(self, emoji: str):
+        await self.ctx.defer(ephemeral=True)
+        try:
+            await self.delete(emoji, lambda content: self.ctx.followup.send(content, ephemeral=True))
+        except Exception as e:
+            logging.exception("Error during deletion of sound mapping")
+            await self.ctx.followup.send("❌ There was an error processing your deletion. Please try again.", ephemeral=True)
+
+    async def delete(self, emoji: str, reply: Callable[[str], Awaitable]):
+        with command_stage_seconds.time(command="removesound", stage="db"):
+            filename = await delete_mapping(self.guild_id, emoji)
+        if not filename:
+            await reply("❌ Could not find a sound mapping to delete.")
+            return
+
+        with command_stage_seconds.time(command="removesound", stage="release"):
+            await release_sound(self.guild_id, filename)
+
+        await reply(f"✅ Deleted mapping for {emoji}.")
+
+        reaction_board = ReactionBoard(self.bot)
+        with command_stage_seconds.time(command="removesound", stage="board"):
+            await reaction_board.update_reactions(self.guild)
+
+
+async def autocomplete_mapped_emojis(ctx: discord.AutocompleteContext) -> list[str]:
+    guild_id = ctx.interaction.guild_id
+    if guild_id is None:
+        return []
+    emojis = await get_all_emojis_for_guild(guild_id)
+    return [emoji for emoji in emojis if ctx.value in emoji][:25]
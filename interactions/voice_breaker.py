@@ -0,0 +1,116 @@
+import discord
+import logging
+import os
+import time
+from logs.log_config import REACTION_LOGGER
+from monitoring.metrics import voice_breaker_trips_total
+
+log = logging.getLogger(REACTION_LOGGER)
+
+VOICE_BREAKER_THRESHOLD = int(os.getenv("VOICE_BREAKER_THRESHOLD", "3"))
+VOICE_REGION_BREAKER_THRESHOLD = int(os.getenv("VOICE_REGION_BREAKER_THRESHOLD", "10"))
+VOICE_BREAKER_COOLDOWN = float(os.getenv("VOICE_BREAKER_COOLDOWN", "60"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probe_started: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return OPEN
+        return HALF_OPEN
+
+    def retry_after(self) -> float:
+        state = self.state
+        if state == OPEN:
+            return self.opened_at + self.cooldown - time.monotonic()
+        if state == HALF_OPEN and self.probe_started is not None:
+            return max(0.0, self.probe_started + self.cooldown - time.monotonic())
+        return 0.0
+
+    def start_probe(self):
+        if self.state == HALF_OPEN:
+            self.probe_started = time.monotonic()
+
+    def end_probe(self):
+        self.probe_started = None
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started = None
+
+    def record_failure(self) -> bool:
+        self.failures += 1
+        self.probe_started = None
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.threshold):
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+
+class VoiceBreakers:
+    def __init__(self, threshold: int = VOICE_BREAKER_THRESHOLD,
+                 region_threshold: int = VOICE_REGION_BREAKER_THRESHOLD,
+                 cooldown: float = VOICE_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.region_threshold = region_threshold
+        self.cooldown = cooldown
+        self._guilds: dict[int, CircuitBreaker] = {}
+        self._regions: dict[str, CircuitBreaker] = {}
+
+    def _breakers(self, voice_channel: discord.VoiceChannel) -> list[tuple[str, str, CircuitBreaker]]:
+        guild_id = voice_channel.guild.id
+        guild_breaker = self._guilds.setdefault(guild_id, CircuitBreaker(self.threshold, self.cooldown))
+        breakers = [("guild", str(guild_id), guild_breaker)]
+        # Channels on automatic region selection share no voice server, so they get no region breaker.
+        if voice_channel.rtc_region:
+            region = str(voice_channel.rtc_region)
+            region_breaker = self._regions.setdefault(region, CircuitBreaker(self.region_threshold, self.cooldown))
+            breakers.append(("region", region, region_breaker))
+        return breakers
+
+    def admit(self, voice_channel: discord.VoiceChannel) -> float:
+        breakers = self._breakers(voice_channel)
+        retry_after = max(breaker.retry_after() for _, _, breaker in breakers)
+        if retry_after <= 0:
+            for _, _, breaker in breakers:
+                breaker.start_probe()
+        return retry_after
+
+    def release(self, voice_channel: discord.VoiceChannel):
+        for _, _, breaker in self._breakers(voice_channel):
+            breaker.end_probe()
+
+    def record(self, voice_channel: discord.VoiceChannel, success: bool, regional: bool = True):
+        for scope, key, breaker in self._breakers(voice_channel):
+            if success:
+                breaker.record_success()
+            elif scope == "region" and not regional:
+                breaker.end_probe()
+            elif breaker.record_failure():
+                voice_breaker_trips_total.inc(scope=scope)
+                log.warning(f"[Breaker] Opened {scope} breaker {key} for {breaker.cooldown:.0f}s")
+
+    def open_count(self, scope: str) -> int:
+        breakers = self._guilds if scope == "guild" else self._regions
+        return sum(1 for breaker in breakers.values() if breaker.state == OPEN)
+
+    def region_states(self) -> list[tuple[dict[str, str], int]]:
+        levels = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+        return [({"region": region}, levels[breaker.state]) for region, breaker in self._regions.items()]
+
+
+voice_breakers = VoiceBreakers()
@@ -0,0 +1,93 @@
+import discord
+import logging
+import os
+import time
+from database_util.db_util import get_all_emojis_for_guild
+from interactions.voice_sessions import voice_sessions, VoiceCircuitOpen
+from logs.log_config import REACTION_LOGGER
+
+log = logging.getLogger(REACTION_LOGGER)
+
+VOICE_PREWARM = os.getenv("VOICE_PREWARM", "false").lower() in ("1", "true", "yes")
+VOICE_PREWARM_MAX = int(os.getenv("VOICE_PREWARM_MAX", "10"))
+VOICE_PREWARM_IDLE_TIMEOUT = float(os.getenv("VOICE_PREWARM_IDLE_TIMEOUT", "120"))
+VOICE_PREWARM_ACTIVITY_WINDOW = float(os.getenv("VOICE_PREWARM_ACTIVITY_WINDOW", str(6 * 3600)))
+
+
+def _has_listeners(channel: discord.VoiceChannel | discord.StageChannel) -> bool:
+    return any(not member.bot for member in channel.members)
+
+
+class VoicePrewarmer:
+    def __init__(self, enabled: bool = VOICE_PREWARM, max_connections: int = VOICE_PREWARM_MAX,
+                 idle_timeout: float = VOICE_PREWARM_IDLE_TIMEOUT,
+                 activity_window: float = VOICE_PREWARM_ACTIVITY_WINDOW):
+        self.enabled = enabled
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.activity_window = activity_window
+        self._last_activity: dict[int, float] = {}
+        self._prewarmed: dict[int, discord.Guild] = {}
+        self._connecting: set[int] = set()
+
+    def note_activity(self, guild_id: int):
+        self._last_activity[guild_id] = time.monotonic()
+        self._prewarmed.pop(guild_id, None)
+
+    def is_recently_active(self, guild_id: int) -> bool:
+        last = self._last_activity.get(guild_id)
+        return last is not None and time.monotonic() - last <= self.activity_window
+
+    def prewarmed(self) -> int:
+        self._prewarmed = {
+            guild_id: guild for guild_id, guild in self._prewarmed.items() if guild.voice_client
+        }
+        return len(self._prewarmed)
+
+    async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState,
+                                    after: discord.VoiceState):
+        if not self.enabled or member.bot:
+            return
+        channel = after.channel
+        if not channel or channel == before.channel:
+            return
+
+        guild = member.guild
+        if not self.is_recently_active(guild.id):
+            return
+
+        vc = guild.voice_client
+        if vc and vc.is_connected():
+            if vc.channel.id == channel.id or vc.is_playing() or _has_listeners(vc.channel):
+                return
+            log.info(f"[Prewarm] Moving idle voice client to {channel.name} in {guild.name}")
+            try:
+                await voice_sessions.acquire(
+                    channel, idle_timeout=self.idle_timeout if guild.id in self._prewarmed else None
+                )
+            except VoiceCircuitOpen:
+                log.info(f"[Prewarm] Breaker open, not reconnecting in {guild.name}")
+            return
+
+        if guild.id in self._prewarmed or guild.id in self._connecting:
+            return
+        if self.prewarmed() + len(self._connecting) >= self.max_connections:
+            log.info(f"[Prewarm] Skipping {guild.name}, {self.max_connections} pre-warmed connection(s) already open")
+            return
+        if not await get_all_emojis_for_guild(guild.id):
+            return
+
+        log.info(f"[Prewarm] Connecting to {channel.name} in {guild.name} ahead of reactions")
+        started = time.monotonic()
+        self._connecting.add(guild.id)
+        try:
+            vc = await voice_sessions.acquire(channel, idle_timeout=self.idle_timeout)
+        except VoiceCircuitOpen:
+            vc = None
+        finally:
+            self._connecting.discard(guild.id)
+        if vc and self._last_activity[guild.id] < started:
+            self._prewarmed[guild.id] = guild
+
+
+voice_prewarmer = VoicePrewarmer()
@@ -0,0 +1,187 @@
+import discord
+import logging
+import os
+import time
+import random
+import asyncio
+from discord import ConnectionClosed
+from audio.mixer import discard_mixer
+from interactions.voice_breaker import voice_breakers
+from logs.log_config import REACTION_LOGGER
+from monitoring.metrics import (
+    voice_lock_wait_seconds, voice_connect_attempts_total, voice_session_resets_total, voice_disconnect_seconds
+)
+
+log = logging.getLogger(REACTION_LOGGER)
+
+VOICE_IDLE_TIMEOUT = float(os.getenv("VOICE_IDLE_TIMEOUT", "300"))
+VOICE_CONNECT_ATTEMPTS = int(os.getenv("VOICE_CONNECT_ATTEMPTS", "5"))
+VOICE_CONNECT_DEADLINE = float(os.getenv("VOICE_CONNECT_DEADLINE", "20"))
+VOICE_CONNECT_BACKOFF_BASE = float(os.getenv("VOICE_CONNECT_BACKOFF_BASE", "0.5"))
+VOICE_CONNECT_BACKOFF_MAX = float(os.getenv("VOICE_CONNECT_BACKOFF_MAX", "8"))
+
+REGIONAL_CLOSE_CODES = {1006, 4009, 4011, 4015}
+
+
+class VoiceCircuitOpen(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"Voice connections are paused for {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0, min(VOICE_CONNECT_BACKOFF_MAX, VOICE_CONNECT_BACKOFF_BASE * 2 ** (attempt - 1)))
+
+def _is_regional(error: Exception | None) -> bool:
+    if isinstance(error, ConnectionClosed):
+        return error.code in REGIONAL_CLOSE_CODES
+    return isinstance(error, (asyncio.TimeoutError, OSError))
+
+async def connect_with_retries(voice_channel: discord.VoiceChannel, max_attempts: int = VOICE_CONNECT_ATTEMPTS,
+                               deadline: float = VOICE_CONNECT_DEADLINE) -> tuple[discord.VoiceClient | None, bool]:
+    deadline_at = time.monotonic() + deadline
+    error = None
+    for attempt in range(1, max_attempts + 1):
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            break
+
+        log.info(f"[Connect] Attempt {attempt} to connect to {voice_channel.name} ({voice_channel.guild.id})")
+        try:
+            vc = await voice_channel.connect(timeout=remaining)
+            log.info("[Connect] Voice handshake complete.")
+            voice_connect_attempts_total.inc(result="success")
+            return vc, False
+        except ConnectionClosed as cc:
+            error = cc
+            log.error(f"[Connect] Voice websocket closed (code {cc.code})")
+            voice_connect_attempts_total.inc(result="closed")
+            if cc.code == 4006:
+                log.warning("[Connect] Session invalidated. Forcing fresh reconnect.")
+                voice_session_resets_total.inc()
+                try:
+                    if voice_channel.guild.voice_client:
+                        await voice_channel.guild.voice_client.disconnect(force=True)
+                except Exception as e:
+                    log.error(f"[Connect] Error during forced disconnect: {e}")
+        except Exception as e:
+            error = e
+            log.error(f"[Connect] Exception connecting to voice: {e}")
+            voice_connect_attempts_total.inc(result="error")
+
+        delay = _backoff(attempt)
+        if attempt == max_attempts or time.monotonic() + delay >= deadline_at:
+            break
+        await asyncio.sleep(delay)
+    log.error("[Connect] Failed to connect after retries")
+    return None, _is_regional(error)
+
+
+class VoiceSessionManager:
+    def __init__(self, idle_timeout: float = VOICE_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._last_used: dict[int, float] = {}
+        self._idle_tasks: dict[int, asyncio.Task] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._idle_timeouts: dict[int, float] = {}
+
+    async def acquire(self, voice_channel: discord.VoiceChannel,
+                      idle_timeout: float | None = None) -> discord.VoiceClient | None:
+        lock = self._locks.setdefault(voice_channel.guild.id, asyncio.Lock())
+        waiting_since = time.monotonic()
+        async with lock:
+            voice_lock_wait_seconds.observe(time.monotonic() - waiting_since)
+            return await self._acquire(voice_channel, idle_timeout)
+
+    async def _acquire(self, voice_channel: discord.VoiceChannel,
+                       idle_timeout: float | None) -> discord.VoiceClient | None:
+        guild = voice_channel.guild
+        vc = guild.voice_client
+
+        if vc and not vc.is_connected():
+            log.info("[Voice] Disconnecting stale client")
+            try:
+                await vc.disconnect(force=True)
+            except Exception as e:
+                log.error(f"[Voice] Error disconnecting stale client: {e}")
+            discard_mixer(guild.id)
+            vc = None
+
+        if vc and vc.channel.id != voice_channel.id:
+            log.info(f"[Voice] Moving client to {voice_channel.name}")
+            try:
+                if vc.is_playing():
+                    vc.stop()
+                await vc.move_to(voice_channel)
+            except Exception as e:
+                log.error(f"[Voice] Error moving client, reconnecting: {e}")
+                try:
+                    await vc.disconnect(force=True)
+                except Exception:
+                    pass
+                discard_mixer(guild.id)
+                vc = None
+
+        if not vc:
+            retry_after = voice_breakers.admit(voice_channel)
+            if retry_after > 0:
+                log.warning(f"[Connect] Breaker open for {voice_channel.guild.id}, not connecting for {retry_after:.0f}s")
+                raise VoiceCircuitOpen(retry_after)
+
+            log.info(f"[Connect] Connecting to voice channel {voice_channel.name}")
+            try:
+                vc, regional = await connect_with_retries(voice_channel)
+            except BaseException:
+                voice_breakers.release(voice_channel)
+                raise
+            connected = vc is not None and vc.is_connected()
+            voice_breakers.record(voice_channel, connected, regional)
+            if not connected:
+                return None
+
+        self.touch(guild, idle_timeout)
+        return vc
+
+    def touch(self, guild: discord.Guild, idle_timeout: float | None = None):
+        self._last_used[guild.id] = time.monotonic()
+        if idle_timeout is None:
+            self._idle_timeouts.pop(guild.id, None)
+        else:
+            self._idle_timeouts[guild.id] = idle_timeout
+        task = self._idle_tasks.get(guild.id)
+        if not task or task.done():
+            self._idle_tasks[guild.id] = asyncio.create_task(self._evict_when_idle(guild))
+
+    async def _evict_when_idle(self, guild: discord.Guild):
+        lock = self._locks.setdefault(guild.id, asyncio.Lock())
+        while True:
+            idle_timeout = self._idle_timeouts.get(guild.id, self.idle_timeout)
+            remaining = self._last_used.get(guild.id, 0) + idle_timeout - time.monotonic()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+                continue
+
+            async with lock:
+                idle_timeout = self._idle_timeouts.get(guild.id, self.idle_timeout)
+                if self._last_used.get(guild.id, 0) + idle_timeout > time.monotonic():
+                    continue
+
+                vc = guild.voice_client
+                if vc and vc.is_playing():
+                    self._last_used[guild.id] = time.monotonic()
+                    continue
+
+                self._idle_tasks.pop(guild.id, None)
+                self._last_used.pop(guild.id, None)
+                self._idle_timeouts.pop(guild.id, None)
+                if vc:
+                    log.info(f"[Voice] Disconnecting idle client in {guild.name}")
+                    try:
+                        with voice_disconnect_seconds.time():
+                            await vc.disconnect()
+                    except Exception as e:
+                        log.warning(f"[Voice] Error disconnecting idle client: {e}")
+                discard_mixer(guild.id)
+                return
+
+voice_sessions = VoiceSessionManager()
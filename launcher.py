@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import os
+import signal
+import sys
+import time
+from dotenv import load_dotenv
+
+from logs.log_config import setup_logging
+
+load_dotenv()
+setup_logging("ReactASound_Launcher.txt")
+
+BOT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bot.py")
+
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))
+SHARDS_PER_WORKER = int(os.getenv("SHARDS_PER_WORKER", "4"))
+WORKER_START_INTERVAL = float(os.getenv("WORKER_START_INTERVAL", "5"))
+WORKER_RESTART_BACKOFF = float(os.getenv("WORKER_RESTART_BACKOFF", "5"))
+WORKER_RESTART_BACKOFF_MAX = float(os.getenv("WORKER_RESTART_BACKOFF_MAX", "300"))
+WORKER_STABLE_AFTER = float(os.getenv("WORKER_STABLE_AFTER", "600"))
+WORKER_SHUTDOWN_TIMEOUT = float(os.getenv("WORKER_SHUTDOWN_TIMEOUT", "30"))
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+
+class Worker:
+    def __init__(self, worker_id: int, shard_ids: list[int]):
+        self.worker_id = worker_id
+        self.shard_ids = shard_ids
+        self.process: asyncio.subprocess.Process | None = None
+        self.restart_requested = False
+
+    @property
+    def name(self) -> str:
+        return f"worker {self.worker_id} (shards {self.shard_ids[0]}-{self.shard_ids[-1]})"
+
+    def env(self) -> dict[str, str]:
+        env = dict(os.environ)
+        env["SHARD_COUNT"] = str(SHARD_COUNT)
+        env["SHARD_IDS"] = ",".join(str(shard_id) for shard_id in self.shard_ids)
+        env["WORKER_ID"] = str(self.worker_id)
+        env["LOG_FILENAME"] = f"ReactASound_Log_worker{self.worker_id}.txt"
+        if METRICS_PORT:
+            env["METRICS_PORT"] = str(METRICS_PORT + self.worker_id)
+        return env
+
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self):
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, BOT_SCRIPT, env=self.env(), cwd=os.path.dirname(BOT_SCRIPT)
+        )
+        logging.info(f"[Launcher] Started {self.name} as pid {self.process.pid}")
+
+    async def stop(self, timeout: float = WORKER_SHUTDOWN_TIMEOUT):
+        if not self.is_running():
+            return
+        logging.info(f"[Launcher] Stopping {self.name}")
+        self.process.send_signal(signal.SIGTERM)
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logging.warning(f"[Launcher] {self.name} did not exit after {timeout:.0f}s, killing it")
+            self.process.kill()
+            await self.process.wait()
+
+
+class Launcher:
+    def __init__(self, workers: list[Worker]):
+        self.workers = workers
+        self._stopping = asyncio.Event()
+        self._restart_task: asyncio.Task | None = None
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGTERM, self._stopping.set)
+        loop.add_signal_handler(signal.SIGINT, self._stopping.set)
+        loop.add_signal_handler(signal.SIGHUP, self.rolling_restart)
+
+        supervisors = [
+            asyncio.create_task(self._supervise(worker, index * WORKER_START_INTERVAL))
+            for index, worker in enumerate(self.workers)
+        ]
+        await self._stopping.wait()
+
+        logging.info("[Launcher] Shutting down workers")
+        if self._restart_task:
+            self._restart_task.cancel()
+        await asyncio.gather(*(worker.stop() for worker in self.workers))
+        for supervisor in supervisors:
+            supervisor.cancel()
+        await asyncio.gather(*supervisors, return_exceptions=True)
+        logging.info("[Launcher] All workers stopped")
+
+    async def _sleep_unless_stopping(self, delay: float) -> bool:
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+            return False
+        except asyncio.TimeoutError:
+            return True
+
+    async def _supervise(self, worker: Worker, start_delay: float):
+        if start_delay and not await self._sleep_unless_stopping(start_delay):
+            return
+
+        backoff = WORKER_RESTART_BACKOFF
+        while not self._stopping.is_set():
+            started = time.monotonic()
+            try:
+                await worker.start()
+                code = await worker.process.wait()
+            except OSError as e:
+                logging.error(f"[Launcher] Could not start {worker.name}: {e}")
+                code = None
+            if self._stopping.is_set():
+                return
+
+            if worker.restart_requested:
+                worker.restart_requested = False
+                continue
+
+            if time.monotonic() - started >= WORKER_STABLE_AFTER:
+                backoff = WORKER_RESTART_BACKOFF
+            logging.warning(f"[Launcher] {worker.name} exited with code {code}, restarting in {backoff:.0f}s")
+            if not await self._sleep_unless_stopping(backoff):
+                return
+            backoff = min(backoff * 2, WORKER_RESTART_BACKOFF_MAX)
+
+    def rolling_restart(self):
+        if self._restart_task and not self._restart_task.done():
+            logging.info("[Launcher] Rolling restart already in progress")
+            return
+        self._restart_task = asyncio.create_task(self._rolling_restart())
+
+    async def _rolling_restart(self):
+        logging.info("[Launcher] Rolling restart requested")
+        for worker in self.workers:
+            if self._stopping.is_set():
+                return
+            if not worker.is_running():
+                continue
+            worker.restart_requested = True
+            await worker.stop()
+            if not await self._sleep_unless_stopping(WORKER_START_INTERVAL):
+                return
+        logging.info("[Launcher] Rolling restart finished")
+
+
+def plan_workers(shard_count: int, shards_per_worker: int) -> list[Worker]:
+    return [
+        Worker(worker_id, list(range(first, min(first + shards_per_worker, shard_count))))
+        for worker_id, first in enumerate(range(0, shard_count, shards_per_worker))
+    ]
+
+
+if __name__ == "__main__":
+    if SHARD_COUNT < 1 or SHARDS_PER_WORKER < 1:
+        logging.error("[Launcher] SHARD_COUNT and SHARDS_PER_WORKER must be positive")
+        sys.exit(1)
+
+    workers = plan_workers(SHARD_COUNT, SHARDS_PER_WORKER)
+    logging.info(f"[Launcher] Running {SHARD_COUNT} shard(s) across {len(workers)} worker(s)")
+    asyncio.run(Launcher(workers).run())
@@ -1,8 +1,18 @@
+import atexit
 import logging
-from logging.handlers import TimedRotatingFileHandler
+import queue
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 import os
 
-def setup_logging():
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+LOG_FILENAME = os.getenv("LOG_FILENAME", "ReactASound_Log.txt")
+REACTION_LOGGER = "reactasound.reaction"
+REACTION_SUMMARY_LOGGER = "reactasound.reaction.summary"
+
+_listener: QueueListener | None = None
+
+def setup_logging(filename: str = LOG_FILENAME):
+    global _listener
     log_dir = "logs"
     os.makedirs(log_dir, exist_ok=True)
 
@@ -11,11 +21,20 @@ def setup_logging():
 
     if not logger.handlers:
         handler = TimedRotatingFileHandler(
-            filename=os.path.join(log_dir, "ReactASound_Log.txt"),
+            filename=os.path.join(log_dir, filename),
             when="midnight",
             interval=1,
             backupCount=7
         )
         formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
         handler.setFormatter(formatter)
-        logger.addHandler(handler)
+
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(QueueHandler(log_queue))
+        _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+    if LOG_FORMAT == "structured":
+        logging.getLogger(REACTION_LOGGER).setLevel(logging.WARNING)
+        logging.getLogger(REACTION_SUMMARY_LOGGER).setLevel(logging.INFO)
@@ -0,0 +1,50 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+
+from logs.log_config import LOG_FORMAT, REACTION_SUMMARY_LOGGER
+from monitoring.metrics import reaction_stage_seconds, reaction_seconds, reactions_total
+
+summary_log = logging.getLogger(REACTION_SUMMARY_LOGGER)
+
+
+class ReactionTrace:
+    def __init__(self, guild_id: int, user_id: int, emoji: str):
+        self.guild_id = guild_id
+        self.user_id = user_id
+        self.emoji = emoji
+        self.started = time.monotonic()
+        self.stages: dict[str, float] = {}
+        self.outcome: str | None = None
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(name, time.monotonic() - start)
+
+    def record(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        reaction_stage_seconds.observe(seconds, stage=name)
+
+    def finish(self, outcome: str):
+        if self.outcome is not None:
+            return
+        self.outcome = outcome
+        total = time.monotonic() - self.started
+        reactions_total.inc(outcome=outcome)
+        reaction_seconds.observe(total, outcome=outcome)
+        if LOG_FORMAT != "structured":
+            return
+
+        summary_log.info(json.dumps({
+            "guild": self.guild_id,
+            "user": self.user_id,
+            "emoji": self.emoji,
+            "outcome": outcome,
+            "total_ms": round(total * 1000, 1),
+            "stages_ms": {name: round(seconds * 1000, 1) for name, seconds in self.stages.items()},
+        }, ensure_ascii=False))
@@ -0,0 +1,181 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: tuple) -> dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    @abstractmethod
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        ...
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, self._labels(key), value) for key, value in self._values.items()]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - start, **labels)
+
+    def samples(self):
+        result = []
+        with self._lock:
+            for key, (counts, total, count) in self._series.items():
+                labels = self._labels(key)
+                for bound, bucket_count in zip(self.buckets, counts):
+                    result.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, bucket_count))
+                result.append((f"{self.name}_sum", labels, total))
+                result.append((f"{self.name}_count", labels, count))
+        return result
+
+
+class CallbackMetric(Metric):
+    def __init__(self, name: str, description: str, kind: str,
+                 callback: Callable[[], list[tuple[dict[str, str], float]] | float]):
+        super().__init__(name, description)
+        self.kind = kind
+        self.callback = callback
+
+    def samples(self):
+        values = self.callback()
+        if not isinstance(values, list):
+            values = [({}, values)]
+        return [(self.name, labels, value) for labels, value in values]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, description, labelnames))
+
+    def histogram(self, name: str, description: str, labelnames: tuple[str, ...] = (),
+                  buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, description, labelnames, buckets))
+
+    def gauge_callback(self, name: str, description: str, callback) -> CallbackMetric:
+        return self.register(CallbackMetric(name, description, "gauge", callback))
+
+    def counter_callback(self, name: str, description: str, callback) -> CallbackMetric:
+        return self.register(CallbackMetric(name, description, "counter", callback))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+reaction_stage_seconds = registry.histogram(
+    "reactasound_reaction_stage_seconds", "Time spent in each stage of handling a reaction.", ("stage",)
+)
+reaction_seconds = registry.histogram(
+    "reactasound_reaction_seconds", "Total time from reaction to finished handling.", ("outcome",)
+)
+reactions_total = registry.counter(
+    "reactasound_reactions_total", "Board reactions handled, by outcome.", ("outcome",)
+)
+voice_lock_wait_seconds = registry.histogram(
+    "reactasound_voice_lock_wait_seconds", "Time spent waiting for the per-guild voice connect lock."
+)
+voice_connect_attempts_total = registry.counter(
+    "reactasound_voice_connect_attempts_total", "Voice connect attempts, by result.", ("result",)
+)
+voice_session_resets_total = registry.counter(
+    "reactasound_voice_session_resets_total", "Voice sessions reset after a 4006 close."
+)
+voice_disconnect_seconds = registry.histogram(
+    "reactasound_voice_disconnect_seconds", "Time taken to disconnect idle voice clients."
+)
+voice_breaker_trips_total = registry.counter(
+    "reactasound_voice_breaker_trips_total", "Voice connect circuit breakers opened, by scope.", ("scope",)
+)
+reaction_removal_seconds = registry.histogram(
+    "reactasound_reaction_removal_seconds", "Time taken by each background reaction removal.", ("result",)
+)
+command_stage_seconds = registry.histogram(
+    "reactasound_command_stage_seconds", "Time spent in each stage of a slash command.", ("command", "stage"),
+    buckets=DEFAULT_BUCKETS + (60.0, 120.0)
+)
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import os
+
+from monitoring.metrics import registry
+from database_util.cache import mapping_cache
+from audio.frame_cache import frame_cache
+from interactions.playback_scheduler import playback_scheduler
+from interactions.reaction_cleanup import reaction_cleanup
+from interactions.voice_prewarm import voice_prewarmer
+from interactions.voice_breaker import voice_breakers
+
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+_server: asyncio.AbstractServer | None = None
+
+
+def _register_runtime_metrics():
+    registry.counter_callback(
+        "reactasound_mapping_cache_lookups_total", "Emoji mapping cache lookups, by result.",
+        lambda: [({"result": "hit"}, mapping_cache.hits), ({"result": "miss"}, mapping_cache.misses)]
+    )
+    registry.gauge_callback(
+        "reactasound_mapping_cache_guilds", "Guilds whose mappings are cached.",
+        lambda: mapping_cache.stats()["guilds"]
+    )
+    registry.counter_callback(
+        "reactasound_frame_cache_lookups_total", "Opus frame cache lookups, by result.",
+        lambda: [({"result": "hit"}, frame_cache.hits), ({"result": "miss"}, frame_cache.misses)]
+    )
+    registry.gauge_callback(
+        "reactasound_frame_cache_bytes", "Bytes held by the Opus frame cache.",
+        lambda: frame_cache.size
+    )
+    registry.gauge_callback(
+        "reactasound_playback_queue_depth", "Reactions queued or playing across all guilds.",
+        lambda: playback_scheduler.stats()["queued"]
+    )
+    registry.gauge_callback(
+        "reactasound_reaction_removals_pending", "Reaction removals waiting for the cleanup worker.",
+        reaction_cleanup.pending
+    )
+    registry.gauge_callback(
+        "reactasound_voice_prewarmed_connections", "Voice connections opened ahead of reactions and not yet used.",
+        voice_prewarmer.prewarmed
+    )
+    registry.gauge_callback(
+        "reactasound_voice_breakers_open", "Open voice connect circuit breakers, by scope.",
+        lambda: [({"scope": scope}, voice_breakers.open_count(scope)) for scope in ("guild", "region")]
+    )
+    registry.gauge_callback(
+        "reactasound_voice_region_breaker_state", "Voice region breaker state: 0 closed, 1 half-open, 2 open.",
+        voice_breakers.region_states
+    )
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+        while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+            pass
+
+        parts = request_line.decode(errors="replace").split()
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+            status, body = "200 OK", registry.render().encode()
+        else:
+            status, body = "404 Not Found", b"Not Found\n"
+
+        writer.write(
+            f"HTTP/1.1 {status}\r\n"
+            "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except Exception as e:
+        logging.warning(f"[Metrics] Error serving request: {e}")
+    finally:
+        writer.close()
+
+
+async def start_metrics_server():
+    global _server
+    if _server or not METRICS_PORT:
+        return
+
+    _register_runtime_metrics()
+    _server = await asyncio.start_server(_handle, METRICS_HOST, METRICS_PORT)
+    logging.info(f"[Metrics] Serving /metrics on {METRICS_HOST}:{METRICS_PORT}")
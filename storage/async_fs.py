@@ -0,0 +1,51 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+FS_WORKERS = int(os.getenv("FS_WORKERS", "4"))
+
+_executor = ThreadPoolExecutor(max_workers=FS_WORKERS, thread_name_prefix="fs")
+_cached_files: dict[str, bytes] = {}
+
+
+async def run(func: Callable[..., Any], *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+async def isfile(path: str) -> bool:
+    return await run(os.path.isfile, path)
+
+
+async def makedirs(path: str):
+    await run(os.makedirs, path, exist_ok=True)
+
+
+async def remove(path: str, missing_ok: bool = False):
+    try:
+        await run(os.remove, path)
+    except FileNotFoundError:
+        if not missing_ok:
+            raise
+
+
+async def replace(source: str, destination: str):
+    await run(os.replace, source, destination)
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as fp:
+        return fp.read()
+
+
+async def read_bytes(path: str) -> bytes:
+    return await run(_read_file, path)
+
+
+async def read_cached(path: str) -> bytes:
+    data = _cached_files.get(path)
+    if data is None:
+        data = _cached_files[path] = await read_bytes(path)
+    return data
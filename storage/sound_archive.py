@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import zipfile
+import zlib
+
+from audio.ingest import SOUND_MAX_BYTES
+from storage.sound_store import Upload, INCOMING_DIR
+
+ARCHIVE_FORMAT = "reactasound-soundboard"
+ARCHIVE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+MANIFEST_MAX_BYTES = 1024 * 1024
+ARCHIVE_MAX_BYTES = int(os.getenv("ARCHIVE_MAX_BYTES", str(200 * 1024 * 1024)))
+ARCHIVE_MAX_SOUNDS = int(os.getenv("ARCHIVE_MAX_SOUNDS", "100"))
+COPY_CHUNK_SIZE = 64 * 1024
+
+_UNPACK_ERRORS = (zipfile.BadZipFile, zlib.error, EOFError, RuntimeError, NotImplementedError)
+
+
+class ArchiveError(Exception):
+    pass
+
+
+class ArchiveEntry:
+    def __init__(self, emoji: str, member: str):
+        self.emoji = emoji
+        self.member = member
+
+
+def read_manifest(archive_path: str) -> list[ArchiveEntry]:
+    try:
+        archive = zipfile.ZipFile(archive_path)
+    except zipfile.BadZipFile:
+        raise ArchiveError("The file is not a valid zip archive.")
+
+    with archive:
+        infos = {info.filename: info for info in archive.infolist() if not info.is_dir()}
+        manifest_info = infos.get(MANIFEST_NAME)
+        if not manifest_info:
+            raise ArchiveError(f"The archive has no {MANIFEST_NAME}.")
+        if manifest_info.file_size > MANIFEST_MAX_BYTES:
+            raise ArchiveError(f"{MANIFEST_NAME} is too large.")
+
+        try:
+            with archive.open(manifest_info) as fp:
+                manifest = json.loads(fp.read(MANIFEST_MAX_BYTES + 1))
+        except (ValueError, UnicodeDecodeError):
+            raise ArchiveError(f"{MANIFEST_NAME} is not valid JSON.")
+        except _UNPACK_ERRORS:
+            raise ArchiveError(f"{MANIFEST_NAME} could not be unpacked.")
+
+        if not isinstance(manifest, dict) or manifest.get("format") != ARCHIVE_FORMAT:
+            raise ArchiveError(f"{MANIFEST_NAME} is not a ReactASound soundboard manifest.")
+        if manifest.get("version") != ARCHIVE_VERSION:
+            raise ArchiveError(f"Unsupported manifest version: {manifest.get('version')}.")
+
+        sounds = manifest.get("sounds")
+        if not isinstance(sounds, list) or not sounds:
+            raise ArchiveError("The manifest lists no sounds.")
+        if len(sounds) > ARCHIVE_MAX_SOUNDS:
+            raise ArchiveError(f"Archives can contain at most {ARCHIVE_MAX_SOUNDS} sounds.")
+
+        entries = []
+        seen = set()
+        total = 0
+        for sound in sounds:
+            emoji = sound.get("emoji") if isinstance(sound, dict) else None
+            member = sound.get("file") if isinstance(sound, dict) else None
+            if not isinstance(emoji, str) or not isinstance(member, str):
+                raise ArchiveError("Every manifest entry needs an emoji and a file.")
+            if emoji in seen:
+                raise ArchiveError(f"{emoji} is listed more than once.")
+            info = infos.get(member)
+            if not info:
+                raise ArchiveError(f"`{member}` is listed in the manifest but missing from the archive.")
+            if info.file_size > SOUND_MAX_BYTES:
+                raise ArchiveError(f"`{member}` is larger than {SOUND_MAX_BYTES // (1024 * 1024)} MB.")
+            total += info.file_size
+            if total > ARCHIVE_MAX_BYTES:
+                raise ArchiveError(f"The archive unpacks to more than {ARCHIVE_MAX_BYTES // (1024 * 1024)} MB.")
+            seen.add(emoji)
+            entries.append(ArchiveEntry(emoji, member))
+        return entries
+
+
+def extract_entry(archive_path: str, entry: ArchiveEntry, name: str) -> Upload:
+    path = os.path.join(INCOMING_DIR, name)
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with zipfile.ZipFile(archive_path) as archive, archive.open(entry.member) as src, open(path, "wb") as dst:
+            while chunk := src.read(COPY_CHUNK_SIZE):
+                size += len(chunk)
+                if size > SOUND_MAX_BYTES:
+                    raise ArchiveError(f"`{entry.member}` is larger than {SOUND_MAX_BYTES // (1024 * 1024)} MB.")
+                hasher.update(chunk)
+                dst.write(chunk)
+    except _UNPACK_ERRORS as e:
+        if os.path.exists(path):
+            os.remove(path)
+        raise ArchiveError(f"`{entry.member}` could not be unpacked.") from e
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return Upload(path, hasher.hexdigest(), size)
+
+
+def build_archive(path: str, sounds: list[tuple[str, str]]) -> list[str]:
+    manifest = {"format": ARCHIVE_FORMAT, "version": ARCHIVE_VERSION, "sounds": []}
+    missing = []
+    members = {}
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for emoji, sound_file in sounds:
+            member = members.get(sound_file)
+            if not member:
+                if not os.path.isfile(sound_file):
+                    missing.append(emoji)
+                    continue
+                member = f"sounds/{len(members) + 1:03d}{os.path.splitext(sound_file)[1]}"
+                archive.write(sound_file, member)
+                members[sound_file] = member
+            manifest["sounds"].append({"emoji": emoji, "file": member})
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2))
+    return missing
@@ -0,0 +1,142 @@
+import aiohttp
+import asyncio
+import contextlib
+import discord
+import hashlib
+import logging
+import os
+
+from audio.ingest import ingest_sound, IngestResult, IngestError, SOUND_MAX_BYTES
+from audio.opus import OPUS_EXTENSION, is_content_addressed
+from database_util.db_util import get_sound_metadata, delete_unreferenced_sound
+from storage import async_fs
+
+SOUND_ROOT = "sound_files"
+OBJECT_DIR = os.path.join(SOUND_ROOT, "objects")
+INCOMING_DIR = os.path.join(SOUND_ROOT, "incoming")
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+_object_locks: dict[str, asyncio.Lock] = {}
+_object_lock_users: dict[str, int] = {}
+
+
+class Upload:
+    def __init__(self, path: str, digest: str, size: int):
+        self.path = path
+        self.digest = digest
+        self.size = size
+
+
+def object_path(filename: str) -> str:
+    return os.path.join(OBJECT_DIR, filename[:2], filename)
+
+
+def upload_filename(upload: Upload) -> str:
+    return upload.digest + OPUS_EXTENSION
+
+
+@contextlib.asynccontextmanager
+async def lock_sounds(*filenames: str):
+    names = sorted(set(filenames))
+    for name in names:
+        _object_locks.setdefault(name, asyncio.Lock())
+        _object_lock_users[name] = _object_lock_users.get(name, 0) + 1
+    try:
+        async with contextlib.AsyncExitStack() as stack:
+            for name in names:
+                await stack.enter_async_context(_object_locks[name])
+            yield
+    finally:
+        for name in names:
+            _object_lock_users[name] -= 1
+            if not _object_lock_users[name]:
+                del _object_lock_users[name]
+                del _object_locks[name]
+
+
+def sound_path(guild_id: int, filename: str) -> str:
+    if is_content_addressed(filename):
+        return object_path(filename)
+    return os.path.join(SOUND_ROOT, str(guild_id), filename)
+
+
+async def stream_upload(attachment: discord.Attachment, max_bytes: int = SOUND_MAX_BYTES,
+                        kind: str = "Sounds") -> Upload:
+    await async_fs.makedirs(INCOMING_DIR)
+    path = os.path.join(INCOMING_DIR, str(attachment.id))
+    hasher = hashlib.sha256()
+    size = 0
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(attachment.url) as response:
+                response.raise_for_status()
+                fp = await async_fs.run(open, path, "wb")
+                try:
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > max_bytes:
+                            raise IngestError(f"{kind} can be at most {max_bytes // (1024 * 1024)} MB.")
+                        hasher.update(chunk)
+                        await async_fs.run(fp.write, chunk)
+                finally:
+                    await async_fs.run(fp.close)
+    except BaseException:
+        await discard_upload(path)
+        raise
+
+    logging.info(f"Streamed {attachment.filename} to {path} ({size} bytes)")
+    return Upload(path, hasher.hexdigest(), size)
+
+
+async def discard_upload(path: str):
+    await async_fs.remove(path, missing_ok=True)
+
+
+async def store_upload(upload: Upload) -> tuple[str, IngestResult]:
+    filename = upload_filename(upload)
+    path = object_path(filename)
+
+    if await async_fs.isfile(path):
+        metadata = await get_sound_metadata(filename)
+        if metadata:
+            logging.info(f"Reusing stored sound {filename}")
+            duration_ms, loudness_lufs = metadata
+            return filename, IngestResult(duration_ms, loudness_lufs)
+
+    await async_fs.makedirs(os.path.dirname(path))
+    tmp_path = f"{path}.{os.path.basename(upload.path)}.tmp"
+    try:
+        result = await ingest_sound(upload.path, tmp_path)
+        await async_fs.replace(tmp_path, path)
+    finally:
+        await discard_upload(tmp_path)
+    return filename, result
+
+
+async def restore_missing(*uploads: Upload):
+    for upload in uploads:
+        filename = upload_filename(upload)
+        if not await async_fs.isfile(object_path(filename)):
+            logging.warning(f"{filename} was released while it was being stored, ingesting it again")
+            await store_upload(upload)
+
+
+async def release_sound(guild_id: int, filename: str):
+    file_path = sound_path(guild_id, filename)
+
+    async def delete_file():
+        try:
+            await async_fs.remove(file_path)
+            logging.info(f"Deleted sound file: {file_path}")
+        except FileNotFoundError:
+            logging.warning(f"File not found when trying to delete: {file_path}")
+        except Exception as e:
+            logging.error(f"Failed to delete file: {file_path} — {e}")
+
+    async with lock_sounds(filename):
+        references = await delete_unreferenced_sound(
+            filename, None if is_content_addressed(filename) else guild_id, delete_file
+        )
+    if references:
+        logging.info(f"Keeping {filename}, still referenced by {references} mapping(s)")